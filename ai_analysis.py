@@ -3,16 +3,178 @@ Market Mirror - AI Analysis Module
 Provides AI-powered trend analysis, insights, and recommendations.
 """
 
+import bisect
 import json
+import math
+import operator
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import statistics
 import re
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - fall back to pure Python
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
 class AIAnalysisError(Exception):
     """Custom exception for AI analysis errors"""
     pass
 
+@dataclass(slots=True)
+class IndividualAnalysis:
+    """Per-asset analysis record - slots-based to keep per-instance memory low
+
+    Supports dict-style access (``record['symbol']`` / ``record.get(...)``)
+    so existing consumers of the analysis result keep working.
+    """
+    symbol: str
+    name: str
+    current_price: float
+    price_change_pct: float
+    trend_direction: str
+    pattern_detected: List[str]
+    strength: str
+    support_resistance: Dict
+    sentiment_score: float
+    risk_level: str
+    summary: str = ''
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict:
+        """Convert the record to a plain dictionary"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+# Maximum number of memoized analyze_trends results kept per analyzer
+_ANALYSIS_CACHE_SIZE = 64
+
+# Price-movement phrasing buckets, selected by bisect instead of an if/elif
+# cascade. nextafter keeps the positive boundaries strict (change > 1, > 5)
+# while the negative ones stay inclusive, matching the original branches.
+_MOVEMENT_TEMPLATES = (
+    "plummeted {:.1f}%",                                # change < -5
+    "declined {:.1f}%",                                 # -5 <= change < -1
+    "remained relatively stable with {:.1f}% change",   # -1 <= change <= 1
+    "gained {:.1f}%",                                   # 1 < change <= 5
+    "surged {:.1f}%"                                    # change > 5
+)
+_MOVEMENT_THRESHOLDS = (-5.0, -1.0, math.nextafter(1.0, math.inf), math.nextafter(5.0, math.inf))
+
+# Market-sentiment buckets over average change, same lookup scheme as above
+_SENTIMENT_BUCKETS = (
+    ('bearish', 'strong'),      # avg < -5
+    ('bearish', 'moderate'),    # -5 <= avg < -2
+    ('neutral', 'weak'),        # -2 <= avg <= 2
+    ('bullish', 'moderate'),    # 2 < avg <= 5
+    ('bullish', 'strong')       # avg > 5
+)
+_SENTIMENT_THRESHOLDS = (-5.0, -2.0, math.nextafter(2.0, math.inf), math.nextafter(5.0, math.inf))
+
+# Condition columns used by the compiled pattern table (two bounds per condition)
+_PATTERN_CONDITION_KEYS = ('momentum_5d', 'rsi', 'price_vs_sma_20', 'price_change_percentage', 'volatility')
+
+# Which indicator key each pattern condition actually reads
+_PATTERN_REQUIRED_INDICATOR = {'price_vs_sma_20': 'sma_20'}
+
+# Batch-extract the hot indicator keys in one builtin call
+_INDICATOR_GETTER = operator.itemgetter('momentum_5d', 'rsi', 'volatility', 'sma_20')
+
+def _extract_indicators(indicators: Dict) -> Tuple[float, float, float, Optional[float]]:
+    """Pull (momentum_5d, rsi, volatility, sma_20) out of an indicator dict
+
+    One itemgetter call against a None-defaulting view replaces four
+    separate .get lookups in the per-asset hot path.
+    """
+    momentum, rsi, volatility, sma_20 = _INDICATOR_GETTER(defaultdict(lambda: None, indicators))
+    return (
+        momentum if momentum is not None else 0,
+        rsi if rsi is not None else 50,
+        volatility if volatility is not None else 0,
+        sma_20
+    )
+
+# Pattern recognition rules and sentiment keywords are pure constants,
+# built once at import time and shared across analyzer instances
+_TREND_PATTERNS = {
+    'bullish_patterns': (
+        {'name': 'Strong Uptrend', 'conditions': {'momentum_5d': (5, 100), 'rsi': (50, 70)}},
+        {'name': 'Breakout', 'conditions': {'price_vs_sma_20': (1.05, 2.0)}},
+        {'name': 'Recovery Rally', 'conditions': {'price_change_percentage': (3, 15), 'volatility': (0, 10)}}
+    ),
+    'bearish_patterns': (
+        {'name': 'Strong Downtrend', 'conditions': {'momentum_5d': (-100, -5), 'rsi': (30, 50)}},
+        {'name': 'Breakdown', 'conditions': {'price_vs_sma_20': (0.5, 0.95)}},
+        {'name': 'Selloff', 'conditions': {'price_change_percentage': (-20, -5), 'volume_surge': True}}
+    ),
+    'neutral_patterns': (
+        {'name': 'Sideways Consolidation', 'conditions': {'volatility': (0, 5), 'momentum_5d': (-2, 2)}},
+        {'name': 'Range Bound', 'conditions': {'rsi': (40, 60), 'price_change_percentage': (-2, 2)}}
+    )
+}
+
+_SENTIMENT_KEYWORDS = {
+    'positive': frozenset(['surge', 'rally', 'bullish', 'breakout', 'momentum', 'strong', 'growth', 'gains']),
+    'negative': frozenset(['drop', 'fall', 'bearish', 'decline', 'crash', 'selloff', 'weakness', 'losses']),
+    'neutral': frozenset(['stable', 'sideways', 'consolidation', 'range', 'mixed', 'uncertain'])
+}
+
+# One precompiled alternation per category: a single automaton pass over the
+# text replaces per-keyword substring scans
+_SENTIMENT_PATTERNS = {
+    category: re.compile(r'\b(?:' + '|'.join(sorted(words)) + r')\b', re.IGNORECASE)
+    for category, words in _SENTIMENT_KEYWORDS.items()
+}
+
+# No fastmath here: the kernel relies on NaN failing the bound checks
+@njit('b1[:](f8[:], f8[:,:])', cache=True, boundscheck=False)
+def _match_all(values, bounds):
+    """Range-check one asset's indicator values against all pattern bounds at once"""
+    out = np.zeros(bounds.shape[0], np.bool_)
+    for i in range(bounds.shape[0]):
+        ok = True
+        for j in range(values.shape[0]):
+            lo = bounds[i, 2 * j]
+            hi = bounds[i, 2 * j + 1]
+            if lo == -np.inf and hi == np.inf:
+                continue  # condition not part of this pattern
+            if not (lo <= values[j] <= hi):
+                ok = False
+                break
+        out[i] = ok
+    return out
+
+@njit('f8(f8[:])', cache=True, fastmath=True, boundscheck=False)
+def _welford_std(a):
+    """Sample standard deviation via Welford's one-pass algorithm"""
+    n = a.shape[0]
+    if n < 2:
+        return 0.0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        x = a[i]
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+    return (m2 / (n - 1)) ** 0.5
+
 class MarketAIAnalyzer:
     """
     AI-powered market analysis class providing trend detection,
@@ -20,37 +182,74 @@ class MarketAIAnalyzer:
     """
     
     def __init__(self):
-        self.analysis_cache = {}
+        self.analysis_cache = OrderedDict()  # LRU-bounded memo of analyze_trends results
         self.trend_patterns = self._initialize_trend_patterns()
         self.sentiment_keywords = self._initialize_sentiment_keywords()
+        self._pattern_names, self._pattern_bounds, self._pattern_required_keys = \
+            self._compile_pattern_table(self.trend_patterns)
     
     def _initialize_trend_patterns(self) -> Dict:
         """Initialize trend pattern recognition rules"""
-        return {
-            'bullish_patterns': [
-                {'name': 'Strong Uptrend', 'conditions': {'momentum_5d': (5, 100), 'rsi': (50, 70)}},
-                {'name': 'Breakout', 'conditions': {'price_vs_sma_20': (1.05, 2.0)}},
-                {'name': 'Recovery Rally', 'conditions': {'price_change_percentage': (3, 15), 'volatility': (0, 10)}}
-            ],
-            'bearish_patterns': [
-                {'name': 'Strong Downtrend', 'conditions': {'momentum_5d': (-100, -5), 'rsi': (30, 50)}},
-                {'name': 'Breakdown', 'conditions': {'price_vs_sma_20': (0.5, 0.95)}},
-                {'name': 'Selloff', 'conditions': {'price_change_percentage': (-20, -5), 'volume_surge': True}}
-            ],
-            'neutral_patterns': [
-                {'name': 'Sideways Consolidation', 'conditions': {'volatility': (0, 5), 'momentum_5d': (-2, 2)}},
-                {'name': 'Range Bound', 'conditions': {'rsi': (40, 60), 'price_change_percentage': (-2, 2)}}
-            ]
-        }
-    
+        return _TREND_PATTERNS
+
     def _initialize_sentiment_keywords(self) -> Dict:
-        """Initialize sentiment analysis keywords"""
+        """Initialize compiled sentiment-keyword matchers"""
+        return _SENTIMENT_PATTERNS
+    
+    def _compile_pattern_table(self, trend_patterns: Dict) -> Tuple[List[str], np.ndarray, List[frozenset]]:
+        """Flatten pattern conditions into a bounds matrix for the compiled matcher"""
+        names = []
+        rows = []
+        required_keys = []
+
+        for category, patterns in trend_patterns.items():
+            for pattern in patterns:
+                row = [-np.inf, np.inf] * len(_PATTERN_CONDITION_KEYS)
+                for idx, key in enumerate(_PATTERN_CONDITION_KEYS):
+                    criteria = pattern['conditions'].get(key)
+                    if criteria is not None:
+                        row[2 * idx] = criteria[0]
+                        row[2 * idx + 1] = criteria[1]
+                # volume_surge is a simplified always-true check, so it adds no bounds
+                names.append(pattern['name'])
+                rows.append(row)
+                required_keys.append(frozenset(
+                    _PATTERN_REQUIRED_INDICATOR.get(cond, cond)
+                    for cond in pattern['conditions']
+                    if cond != 'volume_surge'
+                ))
+
+        return names, np.array(rows, dtype=np.float64), required_keys
+
+    def _build_columns(self, market_data: List[Dict]) -> Dict:
+        """Convert the list-of-dicts snapshot into columnar NumPy arrays
+
+        Built once per analyze_trends call so the overview/risk/comparative
+        helpers run vectorized reductions instead of re-walking the dicts.
+        """
+        n = len(market_data)
+        indicators = [a['technical_indicators'] if 'technical_indicators' in a else None for a in market_data]
+
         return {
-            'positive': ['surge', 'rally', 'bullish', 'breakout', 'momentum', 'strong', 'growth', 'gains'],
-            'negative': ['drop', 'fall', 'bearish', 'decline', 'crash', 'selloff', 'weakness', 'losses'],
-            'neutral': ['stable', 'sideways', 'consolidation', 'range', 'mixed', 'uncertain']
+            'symbol': [a.get('symbol', 'unknown') for a in market_data],
+            'price_change_percentage': np.fromiter(
+                (a.get('price_change_percentage', 0) for a in market_data), np.float64, count=n),
+            'current_price': np.fromiter(
+                (a.get('current_price', 0) for a in market_data), np.float64, count=n),
+            'volume': np.fromiter(
+                (a.get('volume', 0) for a in market_data), np.float64, count=n),
+            'rsi': np.fromiter(
+                ((ti or {}).get('rsi', 50) for ti in indicators), np.float64, count=n),
+            'momentum_5d': np.fromiter(
+                ((ti or {}).get('momentum_5d', 0) for ti in indicators), np.float64, count=n),
+            'volatility': np.fromiter(
+                ((ti or {}).get('volatility', 0) for ti in indicators), np.float64, count=n),
+            'has_indicators': np.fromiter(
+                (ti is not None for ti in indicators), np.bool_, count=n),
+            'has_momentum': np.fromiter(
+                (ti is not None and 'momentum_5d' in ti for ti in indicators), np.bool_, count=n)
         }
-    
+
     def analyze_trends(self, market_data: List[Dict]) -> Dict:
         """
         Perform comprehensive trend analysis on market data
@@ -63,107 +262,170 @@ class MarketAIAnalyzer:
         """
         if not market_data:
             return {'error': 'No market data provided'}
-        
+
+        # Drop malformed assets before anything touches their fields: one
+        # bad value must not abort the whole snapshot (the columnar build
+        # feeds np.fromiter, which has no per-asset recovery point)
+        invalid = [a for a in market_data if not self._is_valid_asset(a)]
+        if invalid:
+            skipped = [a.get('symbol', 'unknown') if isinstance(a, dict) else 'unknown'
+                       for a in invalid]
+            print(f"Skipped {len(skipped)} malformed assets: {', '.join(skipped)}")
+            market_data = [a for a in market_data if self._is_valid_asset(a)]
+            if not market_data:
+                return {'error': 'No market data provided'}
+
+        # Memoize by a cheap fingerprint of the snapshot - dashboards often
+        # poll faster than the underlying data refreshes
+        cache_key = hash(tuple(
+            (a.get('symbol'), a.get('current_price'), a.get('price_change_percentage'), a.get('volume'))
+            for a in market_data
+        ))
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            self.analysis_cache.move_to_end(cache_key)
+            cached['timestamp'] = datetime.now().isoformat()
+            return cached
+
+        # Columnar (SoA) view of the snapshot, shared by all the helpers below
+        cols = self._build_columns(market_data)
+
         analysis_result = {
             'timestamp': datetime.now().isoformat(),
-            'market_overview': self._generate_market_overview(market_data),
+            'market_overview': self._generate_market_overview(market_data, cols),
             'individual_analysis': [],
-            'comparative_analysis': self._perform_comparative_analysis(market_data),
-            'risk_assessment': self._assess_market_risk(market_data),
+            'comparative_analysis': self._perform_comparative_analysis(market_data, cols),
+            'risk_assessment': self._assess_market_risk(market_data, cols),
             'recommendations': []
         }
-        
-        # Analyze each asset individually
-        for asset in market_data:
-            try:
-                individual_analysis = self._analyze_individual_asset(asset)
-                analysis_result['individual_analysis'].append(individual_analysis)
-            except Exception as e:
-                print(f"Error analyzing {asset.get('symbol', 'unknown')}: {str(e)}")
-                continue
-        
+
+        # Sentiment scores for the whole snapshot in one vectorized expression
+        sentiment_scores = self._calculate_sentiment_scores_batch(market_data, cols)
+
+        # Analyze each asset individually; the snapshot was validated
+        # upfront, so the hot loop has no try/except or per-asset checks
+        analysis_result['individual_analysis'] = [
+            self._analyze_individual_asset(asset, sentiment_scores[i])
+            for i, asset in enumerate(market_data)]
+
         # Generate overall recommendations
         analysis_result['recommendations'] = self._generate_recommendations(
             analysis_result['market_overview'],
             analysis_result['individual_analysis'],
             analysis_result['risk_assessment']
         )
-        
+
+        # Store with an LRU bound so the cache cannot grow without limit
+        self.analysis_cache[cache_key] = analysis_result
+        if len(self.analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            self.analysis_cache.popitem(last=False)
+
         return analysis_result
     
-    def _generate_market_overview(self, market_data: List[Dict]) -> Dict:
+    def _generate_market_overview(self, market_data: List[Dict], cols: Optional[Dict] = None) -> Dict:
         """Generate overall market overview"""
         if not market_data:
             return {}
-        
-        # Calculate market-wide statistics
-        price_changes = [asset.get('price_change_percentage', 0) for asset in market_data]
-        volumes = [asset.get('volume', 0) for asset in market_data if asset.get('volume', 0) > 0]
-        
+
+        if cols is None:
+            cols = self._build_columns(market_data)
+
+        # Market-wide statistics from the shared price-change column
+        price_changes = cols['price_change_percentage']
+        gainers = int((price_changes > 0).sum())
+        losers = int((price_changes < 0).sum())
+
         overview = {
             'total_assets': len(market_data),
-            'average_change': statistics.mean(price_changes) if price_changes else 0,
-            'median_change': statistics.median(price_changes) if price_changes else 0,
-            'volatility': statistics.stdev(price_changes) if len(price_changes) > 1 else 0,
-            'gainers': len([x for x in price_changes if x > 0]),
-            'losers': len([x for x in price_changes if x < 0]),
-            'unchanged': len([x for x in price_changes if x == 0])
+            'average_change': float(price_changes.mean()) if price_changes.size else 0,
+            'median_change': float(np.median(price_changes)) if price_changes.size else 0,
+            'volatility': float(_welford_std(price_changes)) if price_changes.size > 1 else 0,
+            'gainers': gainers,
+            'losers': losers,
+            'unchanged': len(price_changes) - gainers - losers
         }
         
-        # Determine market sentiment
-        if overview['average_change'] > 2:
-            overview['sentiment'] = 'bullish'
-            overview['sentiment_strength'] = 'strong' if overview['average_change'] > 5 else 'moderate'
-        elif overview['average_change'] < -2:
-            overview['sentiment'] = 'bearish'
-            overview['sentiment_strength'] = 'strong' if overview['average_change'] < -5 else 'moderate'
-        else:
-            overview['sentiment'] = 'neutral'
-            overview['sentiment_strength'] = 'weak'
-        
-        # Calculate momentum
-        momentum_scores = []
-        for asset in market_data:
-            if 'technical_indicators' in asset and 'momentum_5d' in asset['technical_indicators']:
-                momentum_scores.append(asset['technical_indicators']['momentum_5d'])
+        # Determine market sentiment via the precomputed bucket table
+        bucket = bisect.bisect_right(_SENTIMENT_THRESHOLDS, overview['average_change'])
+        overview['sentiment'], overview['sentiment_strength'] = _SENTIMENT_BUCKETS[bucket]
         
-        if momentum_scores:
-            overview['momentum'] = statistics.mean(momentum_scores)
+        # Calculate momentum over the assets that actually report it
+        has_momentum = cols['has_momentum']
+        if has_momentum.any():
+            overview['momentum'] = float(cols['momentum_5d'][has_momentum].mean())
         else:
             overview['momentum'] = 0
-        
+
         return overview
     
-    def _analyze_individual_asset(self, asset: Dict) -> Dict:
+    def _is_valid_asset(self, asset) -> bool:
+        """Cheap structural check that an asset can be analyzed safely.
+
+        Covers every field the columnar build and pattern math consume:
+        a non-numeric value anywhere here would abort np.fromiter or the
+        sentiment arithmetic for the whole snapshot.
+        """
+        if not isinstance(asset, dict):
+            return False
+        for field in ('current_price', 'price_change_percentage', 'volume'):
+            value = asset.get(field)
+            if value is not None and not isinstance(value, (int, float)):
+                return False
+        indicators = asset.get('technical_indicators')
+        if indicators is not None:
+            if not isinstance(indicators, dict):
+                return False
+            for field in ('rsi', 'momentum_5d', 'volatility', 'sma_20'):
+                value = indicators.get(field)
+                if value is not None and not isinstance(value, (int, float)):
+                    return False
+        history = asset.get('history')
+        if history is not None and not isinstance(history, list):
+            return False
+        return True
+
+    def _analyze_individual_asset(self, asset: Dict, sentiment_score: Optional[float] = None) -> 'IndividualAnalysis':
         """Analyze individual asset trends and patterns"""
-        analysis = {
-            'symbol': asset.get('symbol', 'unknown'),
-            'name': asset.get('name', asset.get('symbol', 'unknown')),
-            'current_price': asset.get('current_price', 0),
-            'price_change_pct': asset.get('price_change_percentage', 0),
-            'trend_direction': self._determine_trend_direction(asset),
-            'pattern_detected': self._detect_patterns(asset),
-            'strength': self._calculate_trend_strength(asset),
-            'support_resistance': self._identify_support_resistance(asset),
-            'sentiment_score': self._calculate_sentiment_score(asset),
-            'risk_level': self._assess_asset_risk(asset)
-        }
-        
+        if sentiment_score is None:
+            sentiment_score = self._calculate_sentiment_score(asset)
+
+        # Extract the hot values once and hand them to the sub-analyses
+        # instead of re-fetching (and re-abs-ing) them in each helper
+        price_change = asset.get('price_change_percentage', 0)
+        if 'technical_indicators' in asset:
+            extracted = _extract_indicators(asset['technical_indicators'])
+            momentum, rsi, volatility, _ = extracted
+        else:
+            extracted = None
+            momentum = rsi = volatility = None
+
+        analysis = IndividualAnalysis(
+            symbol=asset.get('symbol', 'unknown'),
+            name=asset.get('name', asset.get('symbol', 'unknown')),
+            current_price=asset.get('current_price', 0),
+            price_change_pct=price_change,
+            trend_direction=self._determine_trend_direction(price_change, momentum, rsi),
+            pattern_detected=self._detect_patterns(asset, extracted),
+            strength=self._calculate_trend_strength(abs(price_change), momentum, volatility),
+            support_resistance=self._identify_support_resistance(asset),
+            sentiment_score=float(sentiment_score),
+            risk_level=self._assess_asset_risk(asset)
+        )
+
         # Generate natural language summary
-        analysis['summary'] = self._generate_asset_summary(analysis, asset)
-        
+        analysis.summary = self._generate_asset_summary(analysis, asset)
+
         return analysis
     
-    def _determine_trend_direction(self, asset: Dict) -> str:
-        """Determine the primary trend direction"""
-        price_change = asset.get('price_change_percentage', 0)
-        
+    def _determine_trend_direction(self, price_change: float,
+                                   momentum: Optional[float] = None,
+                                   rsi: Optional[float] = None) -> str:
+        """Determine the primary trend direction
+
+        momentum/rsi are None when the asset reports no technical indicators.
+        """
         # Check technical indicators if available
-        if 'technical_indicators' in asset:
-            indicators = asset['technical_indicators']
-            momentum = indicators.get('momentum_5d', 0)
-            rsi = indicators.get('rsi', 50)
-            
+        if momentum is not None:
             # Strong bullish conditions
             if price_change > 3 and momentum > 5 and rsi > 60:
                 return 'strong_bullish'
@@ -185,82 +447,59 @@ class MarketAIAnalyzer:
         else:
             return 'neutral'
     
-    def _detect_patterns(self, asset: Dict) -> List[str]:
+    def _detect_patterns(self, asset: Dict, extracted: Optional[Tuple] = None) -> List[str]:
         """Detect technical patterns in the asset"""
-        detected_patterns = []
-        
         if 'technical_indicators' not in asset:
-            return detected_patterns
-        
+            return []
+
         indicators = asset['technical_indicators']
-        price_change = asset.get('price_change_percentage', 0)
-        
-        # Check each pattern category
-        for category, patterns in self.trend_patterns.items():
-            for pattern in patterns:
-                if self._matches_pattern(asset, pattern):
-                    detected_patterns.append(pattern['name'])
-        
-        return detected_patterns
-    
-    def _matches_pattern(self, asset: Dict, pattern: Dict) -> bool:
-        """Check if asset matches a specific pattern"""
-        conditions = pattern['conditions']
-        indicators = asset.get('technical_indicators', {})
-        
-        for condition, criteria in conditions.items():
-            if condition == 'momentum_5d':
-                value = indicators.get('momentum_5d', 0)
-                if not (criteria[0] <= value <= criteria[1]):
-                    return False
-            
-            elif condition == 'rsi':
-                value = indicators.get('rsi', 50)
-                if not (criteria[0] <= value <= criteria[1]):
-                    return False
-            
-            elif condition == 'price_vs_sma_20':
-                sma_20 = indicators.get('sma_20')
-                if sma_20:
-                    ratio = asset.get('current_price', 0) / sma_20
-                    if not (criteria[0] <= ratio <= criteria[1]):
-                        return False
-                else:
-                    return False
-            
-            elif condition == 'price_change_percentage':
-                value = asset.get('price_change_percentage', 0)
-                if not (criteria[0] <= value <= criteria[1]):
-                    return False
-            
-            elif condition == 'volatility':
-                value = indicators.get('volatility', 0)
-                if not (criteria[0] <= value <= criteria[1]):
-                    return False
-            
-            elif condition == 'volume_surge':
-                # Simple volume analysis - would need historical comparison
-                return True  # Simplified for demo
-        
-        return True
+
+        # Skip patterns whose conditions reference indicators this asset
+        # does not report, so only confirmable patterns reach the kernel
+        present = frozenset(indicators) | {'price_change_percentage'}
+        candidate_rows = [
+            i for i, required in enumerate(self._pattern_required_keys)
+            if required <= present
+        ]
+        if not candidate_rows:
+            return []
+
+        if extracted is None:
+            extracted = _extract_indicators(indicators)
+        momentum, rsi, volatility, sma_20 = extracted
+        # NaN fails any finite bound check, so patterns needing sma_20 are skipped
+        ratio = asset.get('current_price', 0) / sma_20 if sma_20 else np.nan
+
+        values = np.array([
+            momentum,
+            rsi,
+            ratio,
+            asset.get('price_change_percentage', 0),
+            volatility
+        ], dtype=np.float64)
+
+        matched = _match_all(values, self._pattern_bounds[candidate_rows])
+        return [self._pattern_names[i] for i, hit in zip(candidate_rows, matched) if hit]
     
-    def _calculate_trend_strength(self, asset: Dict) -> str:
-        """Calculate the strength of the current trend"""
-        price_change = abs(asset.get('price_change_percentage', 0))
-        
-        if 'technical_indicators' in asset:
-            volatility = asset['technical_indicators'].get('volatility', 0)
-            momentum = abs(asset['technical_indicators'].get('momentum_5d', 0))
-            
+    def _calculate_trend_strength(self, abs_price_change: float,
+                                  momentum: Optional[float] = None,
+                                  volatility: Optional[float] = None) -> str:
+        """Calculate the strength of the current trend
+
+        momentum/volatility are None when no technical indicators exist.
+        """
+        if momentum is not None:
+            abs_momentum = abs(momentum)
+
             # Strong trend: significant price change with low volatility and high momentum
-            if price_change > 5 and volatility < 10 and momentum > 5:
+            if abs_price_change > 5 and volatility < 10 and abs_momentum > 5:
                 return 'strong'
             # Moderate trend
-            elif price_change > 2 and volatility < 15:
+            elif abs_price_change > 2 and volatility < 15:
                 return 'moderate'
-        
+
         # Weak trend
-        if price_change > 1:
+        if abs_price_change > 1:
             return 'weak'
         else:
             return 'very_weak'
@@ -277,37 +516,49 @@ class MarketAIAnalyzer:
                 prices.append(point['price'])
             elif 'close' in point:
                 prices.append(point['close'])
-        
+
         if len(prices) < 10:
             return {}
-        
+
         current_price = asset.get('current_price', prices[-1])
-        
-        # Simple support/resistance calculation
-        recent_high = max(prices)
-        recent_low = min(prices)
-        
-        # Calculate potential levels based on recent ranges
-        resistance_levels = []
-        support_levels = []
-        
-        # Resistance: prices above current
-        for price in prices:
-            if price > current_price * 1.02:  # At least 2% above current
-                resistance_levels.append(price)
-        
-        # Support: prices below current
-        for price in prices:
-            if price < current_price * 0.98:  # At least 2% below current
-                support_levels.append(price)
-        
+
+        # Simple support/resistance calculation via masked NumPy reductions
+        prices_arr = np.asarray(prices, dtype=np.float64)
+        recent_high = float(prices_arr.max())
+        recent_low = float(prices_arr.min())
+
+        # Resistance: prices at least 2% above current; support: at least 2% below
+        above = prices_arr[prices_arr > current_price * 1.02]
+        below = prices_arr[prices_arr < current_price * 0.98]
+
         return {
-            'nearest_resistance': min(resistance_levels) if resistance_levels else recent_high,
-            'nearest_support': max(support_levels) if support_levels else recent_low,
+            'nearest_resistance': float(above.min()) if above.size else recent_high,
+            'nearest_support': float(below.max()) if below.size else recent_low,
             'recent_high': recent_high,
             'recent_low': recent_low
         }
     
+    def _calculate_sentiment_scores_batch(self, market_data: List[Dict], cols: Optional[Dict] = None) -> np.ndarray:
+        """Calculate sentiment scores for all assets as one NumPy expression"""
+        if cols is None:
+            cols = self._build_columns(market_data)
+
+        pc = cols['price_change_percentage']
+        rsi = cols['rsi']
+        momentum = cols['momentum_5d']
+        volume = cols['volume']
+
+        scores = (
+            0.5  # Neutral starting point
+            + (pc / 100) * 0.3  # 30% weight for price change
+            + np.where(rsi > 70, 0.1, np.where(rsi < 30, -0.1, 0.0))  # RSI impact
+            + (momentum / 100) * 0.2  # 20% weight for momentum
+            + np.where(volume > 0, 0.05, 0.0)  # Positive volume impact
+        )
+
+        # Clamp scores between 0 and 1
+        return np.clip(scores, 0, 1)
+
     def _calculate_sentiment_score(self, asset: Dict) -> float:
         """Calculate sentiment score based on various factors"""
         score = 0.5  # Neutral starting point
@@ -364,103 +615,86 @@ class MarketAIAnalyzer:
         else:
             return 'low'
     
-    def _perform_comparative_analysis(self, market_data: List[Dict]) -> Dict:
+    def _perform_comparative_analysis(self, market_data: List[Dict], cols: Optional[Dict] = None) -> Dict:
         """Perform comparative analysis across assets"""
         if len(market_data) < 2:
             return {}
-        
-        # Performance comparison
-        performance_ranking = sorted(
-            market_data,
-            key=lambda x: x.get('price_change_percentage', 0),
-            reverse=True
-        )
-        
-        # Volatility comparison
-        volatility_ranking = []
-        for asset in market_data:
-            volatility = 0
-            if 'technical_indicators' in asset:
-                volatility = asset['technical_indicators'].get('volatility', 0)
-            volatility_ranking.append({
-                'symbol': asset.get('symbol', 'unknown'),
-                'volatility': volatility
-            })
-        
-        volatility_ranking.sort(key=lambda x: x['volatility'])
-        
+
+        if cols is None:
+            cols = self._build_columns(market_data)
+
+        # Only the extremes are reported, so argmax/argmin on the shared
+        # columns replaces sorting or keyed min/max over the dicts
+        symbols = cols['symbol']
+        price_changes = cols['price_change_percentage']
+        volatilities = cols['volatility']
+
+        best_idx = int(price_changes.argmax())
+        worst_idx = int(price_changes.argmin())
+        stable_idx = int(volatilities.argmin())
+        volatile_idx = int(volatilities.argmax())
+
         return {
             'best_performer': {
-                'symbol': performance_ranking[0].get('symbol', 'unknown'),
-                'change': performance_ranking[0].get('price_change_percentage', 0)
+                'symbol': symbols[best_idx],
+                'change': float(price_changes[best_idx])
             },
             'worst_performer': {
-                'symbol': performance_ranking[-1].get('symbol', 'unknown'),
-                'change': performance_ranking[-1].get('price_change_percentage', 0)
+                'symbol': symbols[worst_idx],
+                'change': float(price_changes[worst_idx])
             },
             'most_stable': {
-                'symbol': volatility_ranking[0]['symbol'],
-                'volatility': volatility_ranking[0]['volatility']
+                'symbol': symbols[stable_idx],
+                'volatility': float(volatilities[stable_idx])
             },
             'most_volatile': {
-                'symbol': volatility_ranking[-1]['symbol'],
-                'volatility': volatility_ranking[-1]['volatility']
+                'symbol': symbols[volatile_idx],
+                'volatility': float(volatilities[volatile_idx])
             }
         }
     
-    def _assess_market_risk(self, market_data: List[Dict]) -> Dict:
-        """Assess overall market risk"""
+    def _assess_market_risk(self, market_data: List[Dict], cols: Optional[Dict] = None) -> Dict:
+        """Assess overall market risk and its contributing factors"""
         if not market_data:
             return {}
-        
-        # Calculate risk metrics
-        price_changes = [asset.get('price_change_percentage', 0) for asset in market_data]
-        volatilities = []
-        
-        for asset in market_data:
-            if 'technical_indicators' in asset:
-                vol = asset['technical_indicators'].get('volatility', 0)
-                volatilities.append(vol)
-        
-        # Market risk assessment
-        avg_volatility = statistics.mean(volatilities) if volatilities else 0
-        price_dispersion = statistics.stdev(price_changes) if len(price_changes) > 1 else 0
-        
+
+        if cols is None:
+            cols = self._build_columns(market_data)
+
+        # All reductions come from the shared columns in vectorized form
+        n = len(market_data)
+        price_changes = cols['price_change_percentage']
+        volatilities = cols['volatility'][cols['has_indicators']]
+
+        avg_volatility = float(volatilities.mean()) if volatilities.size else 0
+        price_dispersion = float(_welford_std(price_changes)) if n > 1 else 0
+        high_vol_count = int((volatilities > 15).sum())
+        all_up = bool((price_changes > 5).all())
+        all_down = bool((price_changes < -5).all())
+
         risk_level = 'low'
         if avg_volatility > 15 or price_dispersion > 10:
             risk_level = 'high'
         elif avg_volatility > 8 or price_dispersion > 5:
             risk_level = 'medium'
-        
-        return {
-            'overall_risk_level': risk_level,
-            'average_volatility': avg_volatility,
-            'price_dispersion': price_dispersion,
-            'risk_factors': self._identify_risk_factors(market_data)
-        }
-    
-    def _identify_risk_factors(self, market_data: List[Dict]) -> List[str]:
-        """Identify specific risk factors in the market"""
+
+        # Identify specific risk factors from the same accumulators
         risk_factors = []
-        
-        # High volatility assets
-        high_vol_count = 0
-        for asset in market_data:
-            if 'technical_indicators' in asset:
-                if asset['technical_indicators'].get('volatility', 0) > 15:
-                    high_vol_count += 1
-        
-        if high_vol_count / len(market_data) > 0.5:
+        if high_vol_count / n > 0.5:
             risk_factors.append('widespread_high_volatility')
-        
+
         # Market correlation (simplified)
-        price_changes = [asset.get('price_change_percentage', 0) for asset in market_data]
-        if all(change > 5 for change in price_changes):
+        if all_up:
             risk_factors.append('overheating_market')
-        elif all(change < -5 for change in price_changes):
+        elif all_down:
             risk_factors.append('market_selloff')
-        
-        return risk_factors
+
+        return {
+            'overall_risk_level': risk_level,
+            'average_volatility': avg_volatility,
+            'price_dispersion': price_dispersion,
+            'risk_factors': risk_factors
+        }
     
     def _generate_recommendations(self, market_overview: Dict, individual_analyses: List[Dict], risk_assessment: Dict) -> List[Dict]:
         """Generate AI-powered investment recommendations"""
@@ -519,25 +753,19 @@ class MarketAIAnalyzer:
         
         return recommendations
     
-    def _generate_asset_summary(self, analysis: Dict, asset: Dict) -> str:
+    def _generate_asset_summary(self, analysis: 'IndividualAnalysis', asset: Dict) -> str:
         """Generate natural language summary for an asset"""
         symbol = analysis['symbol']
         price_change = analysis['price_change_pct']
         trend = analysis['trend_direction']
         patterns = analysis['pattern_detected']
         
-        # Start with price movement
-        if price_change > 5:
-            movement_desc = f"surged {price_change:.1f}%"
-        elif price_change > 1:
-            movement_desc = f"gained {price_change:.1f}%"
-        elif price_change < -5:
-            movement_desc = f"plummeted {abs(price_change):.1f}%"
-        elif price_change < -1:
-            movement_desc = f"declined {abs(price_change):.1f}%"
-        else:
-            movement_desc = f"remained relatively stable with {price_change:.1f}% change"
-        
+        # Pick the price-movement phrasing from the precompiled bucket table
+        bucket = bisect.bisect_right(_MOVEMENT_THRESHOLDS, price_change)
+        movement_desc = _MOVEMENT_TEMPLATES[bucket].format(
+            abs(price_change) if bucket < 2 else price_change
+        )
+
         # Add trend context
         trend_context = ""
         if 'strong' in trend:
@@ -585,9 +813,14 @@ class MarketAIAnalyzer:
         # Individual asset highlights
         individual_analyses = analysis_result.get('individual_analysis', [])
         if individual_analyses:
-            # Best and worst performers
-            best_performer = max(individual_analyses, key=lambda x: x.get('price_change_pct', 0))
-            worst_performer = min(individual_analyses, key=lambda x: x.get('price_change_pct', 0))
+            # Best and worst performers via one argmax/argmin pass
+            pc_array = np.fromiter(
+                (x.get('price_change_pct', 0) for x in individual_analyses),
+                np.float64,
+                count=len(individual_analyses)
+            )
+            best_performer = individual_analyses[int(pc_array.argmax())]
+            worst_performer = individual_analyses[int(pc_array.argmin())]
             
             highlights = f"**Performance Highlights**: {best_performer['symbol']} leads with "
             highlights += f"{best_performer['price_change_pct']:.2f}% gains, while "
@@ -629,8 +862,9 @@ class MarketAIAnalyzer:
         # Combine all sections
         full_report = "\n\n".join(report_sections)
         
-        # Add timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Add timestamp - isoformat skips strftime's locale-aware format
+        # pipeline and produces the same "YYYY-MM-DD HH:MM:SS" layout
+        timestamp = datetime.now().isoformat(sep=' ', timespec='seconds')
         full_report = f"# Market Analysis Report - {timestamp}\n\n{full_report}"
         
         return full_report
@@ -3,48 +3,164 @@ Market Mirror - Alerts and Recommendation Engine
 Handles real-time alerts, threshold monitoring, and automated notifications.
 """
 
+import itertools
 import json
+import operator
+import queue
+import sys
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Callable, Any
 import threading
 import time
 
+import numpy as np
+
+try:
+    import orjson
+    def _dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # orjson is optional - fall back to the stdlib
+    def _dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional - fall back to pure Python
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+    prange = range
+
 class AlertEngineError(Exception):
     """Custom exception for alert engine errors"""
     pass
 
+# Integer codes for alert fields, assigned when alerts are created
+_TYPE_CODES = {'price': 0, 'change_percent': 1, 'volume': 2, 'technical': 3}
+_COND_CODES = {'above': 0, 'below': 1, 'equals': 2}
+
+def _approx_eq(current_value: float, threshold: float) -> bool:
+    return abs(current_value - threshold) < 0.01  # Small tolerance for floats
+
+# Comparators indexed by condition code, mirroring the kernel's branches
+_CMP = (operator.gt, operator.lt, _approx_eq)
+
+# Ring-buffer capacity for triggered-alert history and the notification log
+_HISTORY_MAXLEN = 10_000
+
+# Maximum number of recommendation batches kept in the cache
+_RECOMMENDATION_CACHE_SIZE = 256
+
+# Pending notifications allowed before new ones are dropped
+_NOTIFY_QUEUE_MAXLEN = 10_000
+
+# No fastmath: NaN values must keep failing every comparison. nogil so
+# callers sharding alerts across threads overlap inside the kernel, and
+# parallel/prange splits large fan-outs across cores (each iteration
+# writes its own out[i], so rows never alias)
+@njit('b1[:](f8[:], i1[:], f8[:])', cache=True, boundscheck=False,
+      nogil=True, parallel=True)
+def _eval_alerts_kernel(values, cond_codes, thresholds):
+    """Evaluate all alert conditions in one fused compiled pass"""
+    n = values.shape[0]
+    out = np.zeros(n, np.bool_)
+    for i in prange(n):
+        value = values[i]
+        threshold = thresholds[i]
+        code = cond_codes[i]
+        if code == 0:
+            out[i] = value > threshold
+        elif code == 1:
+            out[i] = value < threshold
+        elif code == 2:
+            out[i] = abs(value - threshold) < 0.01
+    return out
+
 class Alert:
     """Represents a single market alert"""
-    
-    def __init__(self, alert_id: str, alert_type: str, symbol: str, condition: str, 
+
+    # Flat slot storage: no per-instance __dict__, which roughly halves
+    # memory at alert counts in the thousands and speeds up the attribute
+    # reads in the check loop
+    __slots__ = ('alert_id', 'alert_type', 'symbol', 'condition', 'cond_code',
+                 'threshold', 'message', 'priority', 'created_at',
+                 'triggered_at', 'is_active', 'trigger_count', 'indicator',
+                 'symbol_id', '_dict_cache', '_created_iso', '_prefix_json',
+                 '_threshold_abs')
+
+    def __init__(self, alert_id: str, alert_type: str, symbol: str, condition: str,
                  threshold: float, message: str, priority: str = 'medium'):
         self.alert_id = alert_id
         self.alert_type = alert_type  # 'price', 'volume', 'change_percent', 'technical'
         self.symbol = symbol
         self.condition = condition  # 'above', 'below', 'equals'
+        self.cond_code = _COND_CODES.get(condition, -1)
         self.threshold = threshold
+        # change_percent alerts always compare magnitudes; fold the abs in
+        # here instead of recomputing it per tick
+        self._threshold_abs = abs(threshold)
         self.message = message
         self.priority = priority  # 'low', 'medium', 'high', 'critical'
         self.created_at = datetime.now()
         self.triggered_at = None
         self.is_active = True
         self.trigger_count = 0
-    
+        self.indicator = None  # set for technical alerts
+        self.symbol_id = -1  # assigned when the engine registers the alert
+        self._dict_cache = None  # memoized to_dict form, cleared on mutation
+        self._created_iso = self.created_at.isoformat()
+        # Everything except trigger bookkeeping is immutable, so serialize
+        # it once; to_json_bytes only formats the mutable tail per call
+        self._prefix_json = _dumps_bytes({
+            'alert_id': alert_id,
+            'alert_type': alert_type,
+            'symbol': symbol,
+            'condition': condition,
+            'threshold': threshold,
+            'message': message,
+            'priority': priority,
+            'created_at': self._created_iso
+        })[:-1]
+
+    def _mark_dirty(self):
+        """Invalidate the cached dictionary form after a state change"""
+        self._dict_cache = None
+
     def to_dict(self) -> Dict:
         """Convert alert to dictionary"""
-        return {
-            'alert_id': self.alert_id,
-            'alert_type': self.alert_type,
-            'symbol': self.symbol,
-            'condition': self.condition,
-            'threshold': self.threshold,
-            'message': self.message,
-            'priority': self.priority,
-            'created_at': self.created_at.isoformat(),
-            'triggered_at': self.triggered_at.isoformat() if self.triggered_at else None,
-            'is_active': self.is_active,
-            'trigger_count': self.trigger_count
-        }
+        cached = self._dict_cache
+        if cached is None:
+            cached = {
+                'alert_id': self.alert_id,
+                'alert_type': self.alert_type,
+                'symbol': self.symbol,
+                'condition': self.condition,
+                'threshold': self.threshold,
+                'message': self.message,
+                'priority': self.priority,
+                'created_at': self._created_iso,
+                'triggered_at': self.triggered_at.isoformat() if self.triggered_at else None,
+                'is_active': self.is_active,
+                'trigger_count': self.trigger_count
+            }
+            self._dict_cache = cached
+        # Copy so callers can annotate (e.g. current_value) without
+        # corrupting the cache
+        return dict(cached)
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize the alert to JSON bytes, reusing the immutable prefix"""
+        if self.triggered_at is not None:
+            triggered = f'"{self.triggered_at.isoformat()}"'
+        else:
+            triggered = 'null'
+        is_active = 'true' if self.is_active else 'false'
+        tail = f',"triggered_at":{triggered},"is_active":{is_active},"trigger_count":{self.trigger_count}}}'
+        return self._prefix_json + tail.encode()
 
 class AlertsEngine:
     """
@@ -54,13 +170,49 @@ class AlertsEngine:
     
     def __init__(self):
         self.alerts = {}  # Dictionary of active alerts
-        self.alert_history = []  # List of triggered alerts
+        # Monotonic counter for alert IDs: int(time.time()) only has
+        # 1-second resolution, so rapid additions used to collide and
+        # silently overwrite each other in self.alerts
+        self._alert_id_counter = itertools.count()
+        # Guards alert registry writes and row-snapshot reads: the monitor
+        # thread rebuilds rows while callers add/remove alerts
+        self._alerts_lock = threading.RLock()
+        # Bounded rings: O(1) appends, bounded memory on long runs, and
+        # safe single-append/iter across threads under the GIL
+        self.alert_history = deque(maxlen=_HISTORY_MAXLEN)
+        self.alert_log = deque(maxlen=_HISTORY_MAXLEN)
         self.notification_handlers = []  # List of notification functions
-        self.is_monitoring = False
+        self._stop_event = threading.Event()
+        self._tick_event = threading.Event()
         self.monitor_thread = None
         self.check_interval = 10  # seconds between checks
-        self.recommendation_cache = {}
-        
+        self.recommendation_cache = OrderedDict()  # timestamp -> recs, oldest first
+        # Fingerprint of the last analysis recommendations were built from,
+        # so an unchanged tick returns the previous batch untouched
+        self._last_reco_hash = None
+        self._last_recommendations = []
+
+        # SoA view of the active alerts, rebuilt lazily when alerts change
+        self._alert_rows = None
+        self._alert_rows_dirty = True
+
+        # Interned symbol table: alerts store an integer id so ticks index
+        # into a per-id slot table instead of hashing symbol strings
+        self._symbol_to_id = {}
+        self._id_to_symbol = []
+
+        # Marshaling function specialized to the current symbol table via
+        # exec; rebuilt lazily whenever a new symbol is interned
+        self._extract = None
+
+        # Notifications are handed to a background thread so print/log IO
+        # never stalls check_alerts
+        self._notify_q = queue.Queue(maxsize=_NOTIFY_QUEUE_MAXLEN)
+        self._dropped_notifications = 0
+        self._notify_thread = threading.Thread(
+            target=self._notification_worker, daemon=True, name='alerts-notify')
+        self._notify_thread.start()
+
         # Initialize default notification handlers
         self._initialize_default_handlers()
     
@@ -70,6 +222,14 @@ class AlertsEngine:
             self._console_notification_handler,
             self._log_notification_handler
         ]
+        # The delivery pipeline is batch-oriented: each entry takes the full
+        # list of alerts triggered in a tick. Dispatch iterates this tuple;
+        # rebuilt only when handlers change
+        self._batch_handlers = [
+            self._console_batch_handler,
+            self._log_batch_handler
+        ]
+        self._handlers_tuple = tuple(self._batch_handlers)
     
     def add_price_alert(self, symbol: str, condition: str, threshold: float, 
                        priority: str = 'medium') -> str:
@@ -85,7 +245,7 @@ class AlertsEngine:
         Returns:
             Alert ID string
         """
-        alert_id = f"price_{symbol}_{condition}_{threshold}_{int(time.time())}"
+        alert_id = f"price_{symbol}_{condition}_{threshold}_{next(self._alert_id_counter)}"
         
         message = f"{symbol} price {condition} ${threshold:,.2f}"
         
@@ -99,7 +259,10 @@ class AlertsEngine:
             priority=priority
         )
         
-        self.alerts[alert_id] = alert
+        with self._alerts_lock:
+            alert.symbol_id = self._intern_symbol(symbol)
+            self.alerts[alert_id] = alert
+            self._alert_rows_dirty = True
         print(f"Price alert added: {message}")
         
         return alert_id
@@ -119,7 +282,7 @@ class AlertsEngine:
         Returns:
             Alert ID string
         """
-        alert_id = f"change_{symbol}_{condition}_{threshold}_{timeframe}_{int(time.time())}"
+        alert_id = f"change_{symbol}_{condition}_{threshold}_{timeframe}_{next(self._alert_id_counter)}"
         
         direction = "gained" if condition == "above" and threshold > 0 else "lost"
         message = f"{symbol} {direction} more than {abs(threshold):.1f}% in {timeframe}"
@@ -134,7 +297,10 @@ class AlertsEngine:
             priority=priority
         )
         
-        self.alerts[alert_id] = alert
+        with self._alerts_lock:
+            alert.symbol_id = self._intern_symbol(symbol)
+            self.alerts[alert_id] = alert
+            self._alert_rows_dirty = True
         print(f"Percentage change alert added: {message}")
         
         return alert_id
@@ -153,7 +319,7 @@ class AlertsEngine:
         Returns:
             Alert ID string
         """
-        alert_id = f"volume_{symbol}_{condition}_{threshold}_{int(time.time())}"
+        alert_id = f"volume_{symbol}_{condition}_{threshold}_{next(self._alert_id_counter)}"
         
         message = f"{symbol} volume {condition} {threshold:,.0f}"
         
@@ -167,7 +333,10 @@ class AlertsEngine:
             priority=priority
         )
         
-        self.alerts[alert_id] = alert
+        with self._alerts_lock:
+            alert.symbol_id = self._intern_symbol(symbol)
+            self.alerts[alert_id] = alert
+            self._alert_rows_dirty = True
         print(f"Volume alert added: {message}")
         
         return alert_id
@@ -187,7 +356,7 @@ class AlertsEngine:
         Returns:
             Alert ID string
         """
-        alert_id = f"tech_{symbol}_{indicator}_{condition}_{threshold}_{int(time.time())}"
+        alert_id = f"tech_{symbol}_{indicator}_{condition}_{threshold}_{next(self._alert_id_counter)}"
         
         message = f"{symbol} {indicator.upper()} {condition} {threshold}"
         
@@ -204,7 +373,10 @@ class AlertsEngine:
         # Store the indicator name for checking
         alert.indicator = indicator
         
-        self.alerts[alert_id] = alert
+        with self._alerts_lock:
+            alert.symbol_id = self._intern_symbol(symbol)
+            self.alerts[alert_id] = alert
+            self._alert_rows_dirty = True
         print(f"Technical alert added: {message}")
         
         return alert_id
@@ -219,9 +391,11 @@ class AlertsEngine:
         Returns:
             True if alert was removed, False if not found
         """
-        if alert_id in self.alerts:
-            alert = self.alerts[alert_id]
-            del self.alerts[alert_id]
+        with self._alerts_lock:
+            alert = self.alerts.pop(alert_id, None)
+            if alert is not None:
+                self._alert_rows_dirty = True
+        if alert is not None:
             print(f"Alert removed: {alert.message}")
             return True
         return False
@@ -232,97 +406,208 @@ class AlertsEngine:
     
     def get_alert_history(self, limit: int = 50) -> List[Dict]:
         """Get recent alert history"""
-        return self.alert_history[-limit:]
+        return list(itertools.islice(reversed(self.alert_history), limit))[::-1]
     
+    def _intern_symbol(self, symbol: str) -> int:
+        """Return the stable integer id for a symbol, assigning one if new"""
+        sid = self._symbol_to_id.get(symbol)
+        if sid is None:
+            sid = len(self._id_to_symbol)
+            self._symbol_to_id[symbol] = sid
+            self._id_to_symbol.append(symbol)
+            self._extract = None  # watchlist grew - respecialize the extractor
+        return sid
+
+    def _build_extractor(self):
+        """Compile a tick-marshaling function specialized to the watchlist
+
+        The generated function slots each market item into the symbol index
+        and writes the three scalar alert inputs (price, |change|, volume)
+        straight into a column matrix, with the symbol lookup and abs bound
+        as locals instead of attribute loads on every item.
+        """
+        src = (
+            "def _extract(market_data, items_by_id, present, out,\n"
+            "             _sym_get=_sym_get, _abs=abs):\n"
+            "    for item in market_data:\n"
+            "        sid = _sym_get(item.get('symbol'))\n"
+            "        if sid is None:\n"
+            "            continue\n"
+            "        items_by_id[sid] = item\n"
+            "        present[sid] = True\n"
+            "        out[sid, 0] = item.get('current_price', 0)\n"
+            "        out[sid, 1] = _abs(item.get('price_change_percentage', 0))\n"
+            "        out[sid, 2] = item.get('volume', 0)\n"
+        )
+        namespace = {'_sym_get': self._symbol_to_id.get}
+        exec(src, namespace)
+        self._extract = namespace['_extract']
+
+    def _rebuild_alert_rows(self):
+        """Rebuild the SoA columns (parallel arrays) for the active alerts"""
+        # Snapshot under the lock so a concurrent add/remove can't resize
+        # the dict mid-iteration; the scan below works on the snapshot
+        with self._alerts_lock:
+            active = [alert for alert in self.alerts.values() if alert.is_active]
+            self._alert_rows_dirty = False
+        n = len(active)
+
+        cond_codes = np.empty(n, dtype=np.int8)
+        thresholds = np.empty(n, dtype=np.float64)
+        symbol_ids = np.fromiter(
+            (alert.symbol_id for alert in active), np.int64, count=n)
+        # Column each alert reads from the extractor matrix; 'technical'
+        # (code 3) has no column and falls back to the per-alert lookup
+        type_cols = np.fromiter(
+            (_TYPE_CODES[alert.alert_type] for alert in active), np.int64, count=n)
+
+        for i, alert in enumerate(active):
+            if alert.alert_type == 'change_percent':
+                # Change alerts always fire on |change| above |threshold|
+                cond_codes[i] = _COND_CODES['above']
+                thresholds[i] = alert._threshold_abs
+            else:
+                cond_codes[i] = alert.cond_code
+                thresholds[i] = alert.threshold
+
+        self._alert_rows = (active, cond_codes, thresholds, symbol_ids, type_cols)
+
+    def _current_alert_value(self, alert: 'Alert', asset_data: Optional[Dict]) -> float:
+        """Value an alert compares against this tick; NaN when unavailable"""
+        if asset_data is None:
+            return np.nan
+
+        alert_type = alert.alert_type
+        if alert_type == 'price':
+            return asset_data.get('current_price', 0)
+        elif alert_type == 'change_percent':
+            return abs(asset_data.get('price_change_percentage', 0))
+        elif alert_type == 'volume':
+            return asset_data.get('volume', 0)
+        elif alert_type == 'technical':
+            indicators = asset_data.get('technical_indicators')
+            if not indicators or alert.indicator is None:
+                return np.nan
+            value = indicators.get(alert.indicator)
+            return value if value is not None else np.nan
+        return np.nan
+
     def check_alerts(self, market_data: List[Dict]) -> List[Dict]:
         """
         Check all active alerts against current market data
-        
+
         Args:
             market_data: List of current market data
-            
+
         Returns:
             List of triggered alerts
         """
         triggered_alerts = []
-        
-        # Create a lookup dictionary for market data
-        data_lookup = {item.get('symbol', ''): item for item in market_data}
-        
-        for alert_id, alert in list(self.alerts.items()):
-            if not alert.is_active:
-                continue
-            
-            symbol = alert.symbol
-            if symbol not in data_lookup:
-                continue
-            
-            asset_data = data_lookup[symbol]
-            
+
+        if self._alert_rows_dirty:
+            self._rebuild_alert_rows()
+
+        active, cond_codes, thresholds, symbol_ids, type_cols = self._alert_rows
+        if not active:
+            return triggered_alerts
+
+        # Marshal the tick through the watchlist-specialized extractor: one
+        # pass slots items into the symbol index and lands the scalar alert
+        # inputs in a (symbol, field) matrix
+        if self._extract is None:
+            self._build_extractor()
+        n_symbols = len(self._id_to_symbol)
+        items_by_id = [None] * n_symbols
+        present = np.zeros(n_symbols, dtype=np.bool_)
+        field_vals = np.empty((n_symbols, 3), dtype=np.float64)
+        self._extract(market_data, items_by_id, present, field_vals)
+
+        # Only alerts whose symbol actually showed up this tick need a
+        # value: a sparse update touches a handful of rows, not all of them
+        candidates = np.nonzero(present[symbol_ids])[0]
+        if candidates.size == 0:
+            return triggered_alerts
+
+        # Gather candidate values straight from the matrix; technical alerts
+        # have no column and keep the per-alert indicator lookup. NaN values
+        # fail every comparison, matching the old skip behavior.
+        cand_cols = type_cols[candidates]
+        values = field_vals[symbol_ids[candidates], np.minimum(cand_cols, 2)]
+        for j in np.nonzero(cand_cols == _TYPE_CODES['technical'])[0]:
+            alert = active[candidates[j]]
+            values[j] = self._current_alert_value(alert, items_by_id[alert.symbol_id])
+        mask = _eval_alerts_kernel(values, cond_codes[candidates], thresholds[candidates])
+
+        # One timestamp per tick: every alert triggered by the same market
+        # snapshot shares it, and the clock is read once instead of per hit
+        now = datetime.now()
+
+        for idx in candidates[mask]:
+            alert = active[idx]
             try:
-                if self._check_single_alert(alert, asset_data):
-                    # Alert triggered
-                    alert.triggered_at = datetime.now()
-                    alert.trigger_count += 1
-                    
-                    triggered_alert = alert.to_dict()
-                    triggered_alert['current_value'] = self._get_alert_current_value(alert, asset_data)
-                    
-                    triggered_alerts.append(triggered_alert)
-                    self.alert_history.append(triggered_alert)
-                    
-                    # Send notifications
-                    self._send_notifications(triggered_alert)
-                    
-                    # Remove one-time alerts or deactivate recurring ones
-                    if alert.alert_type in ['price', 'change_percent']:
-                        alert.is_active = False  # One-time alert
-                    
-                    print(f"ALERT TRIGGERED: {alert.message}")
-                
+                # Alert triggered
+                alert.triggered_at = now
+                alert.trigger_count += 1
+                alert._mark_dirty()
+
+                triggered_alert = alert.to_dict()
+                triggered_alert['current_value'] = self._get_alert_current_value(
+                    alert, items_by_id[alert.symbol_id])
+
+                triggered_alerts.append(triggered_alert)
+                self.alert_history.append(triggered_alert)
+
+                # Remove one-time alerts or deactivate recurring ones
+                if alert.alert_type in ['price', 'change_percent']:
+                    alert.is_active = False  # One-time alert
+                    alert._mark_dirty()
+                    self._alert_rows_dirty = True
+
+                print(f"ALERT TRIGGERED: {alert.message}")
+
             except Exception as e:
-                print(f"Error checking alert {alert_id}: {str(e)}")
+                print(f"Error checking alert {alert.alert_id}: {str(e)}")
                 continue
-        
+
+        # One batch per tick: handlers hold the IO lock once however many
+        # alerts fired
+        self._send_notifications_batch(triggered_alerts)
+
         return triggered_alerts
     
     def _check_single_alert(self, alert: Alert, asset_data: Dict) -> bool:
         """Check if a single alert condition is met"""
         if alert.alert_type == 'price':
             current_price = asset_data.get('current_price', 0)
-            return self._evaluate_condition(current_price, alert.condition, alert.threshold)
-        
+            return self._evaluate_condition(current_price, alert.cond_code, alert.threshold)
+
         elif alert.alert_type == 'change_percent':
             change_percent = asset_data.get('price_change_percentage', 0)
-            return self._evaluate_condition(abs(change_percent), 'above', abs(alert.threshold))
-        
+            return self._evaluate_condition(abs(change_percent), _COND_CODES['above'],
+                                            alert._threshold_abs)
+
         elif alert.alert_type == 'volume':
             volume = asset_data.get('volume', 0)
-            return self._evaluate_condition(volume, alert.condition, alert.threshold)
-        
+            return self._evaluate_condition(volume, alert.cond_code, alert.threshold)
+
         elif alert.alert_type == 'technical':
             if 'technical_indicators' not in asset_data:
                 return False
-            
+
             indicators = asset_data['technical_indicators']
-            if not hasattr(alert, 'indicator') or alert.indicator not in indicators:
+            if alert.indicator is None or alert.indicator not in indicators:
                 return False
-            
+
             indicator_value = indicators[alert.indicator]
-            return self._evaluate_condition(indicator_value, alert.condition, alert.threshold)
-        
+            return self._evaluate_condition(indicator_value, alert.cond_code, alert.threshold)
+
+        return False
+
+    def _evaluate_condition(self, current_value: float, cond_code: int, threshold: float) -> bool:
+        """Evaluate a condition via its precomputed comparator"""
+        if 0 <= cond_code < len(_CMP):
+            return _CMP[cond_code](current_value, threshold)
         return False
-    
-    def _evaluate_condition(self, current_value: float, condition: str, threshold: float) -> bool:
-        """Evaluate if a condition is met"""
-        if condition == 'above':
-            return current_value > threshold
-        elif condition == 'below':
-            return current_value < threshold
-        elif condition == 'equals':
-            return abs(current_value - threshold) < 0.01  # Small tolerance for floats
-        else:
-            return False
     
     def _get_alert_current_value(self, alert: Alert, asset_data: Dict) -> float:
         """Get the current value that triggered the alert"""
@@ -332,43 +617,93 @@ class AlertsEngine:
             return asset_data.get('price_change_percentage', 0)
         elif alert.alert_type == 'volume':
             return asset_data.get('volume', 0)
-        elif alert.alert_type == 'technical' and hasattr(alert, 'indicator'):
+        elif alert.alert_type == 'technical' and alert.indicator is not None:
             indicators = asset_data.get('technical_indicators', {})
             return indicators.get(alert.indicator, 0)
         return 0
     
     def _send_notifications(self, triggered_alert: Dict):
-        """Send notifications for triggered alert"""
-        for handler in self.notification_handlers:
-            try:
-                handler(triggered_alert)
-            except Exception as e:
-                print(f"Error in notification handler: {str(e)}")
-    
-    def _console_notification_handler(self, alert: Dict):
-        """Default console notification handler"""
+        """Queue a single triggered alert (delivered off-thread)"""
+        self._send_notifications_batch([triggered_alert])
+
+    def _send_notifications_batch(self, triggered_alerts: List[Dict]):
+        """Queue one tick's triggered alerts as a single batch"""
+        if not triggered_alerts or not self._handlers_tuple:
+            return
+        try:
+            self._notify_q.put_nowait(triggered_alerts)
+        except queue.Full:
+            # Handlers are badly backed up - drop rather than stall the tick
+            self._dropped_notifications += len(triggered_alerts)
+
+    def _notification_worker(self):
+        """Deliver queued notification batches on a background thread"""
+        while True:
+            batch = self._notify_q.get()
+            for handler in self._handlers_tuple:
+                try:
+                    handler(batch)
+                except Exception as e:
+                    print(f"Error in notification handler: {str(e)}")
+            self._notify_q.task_done()
+
+    def _format_console_notification(self, alert: Dict) -> str:
+        """Format one alert as a console notification line"""
         priority = alert.get('priority', 'medium').upper()
         symbol = alert.get('symbol', 'UNKNOWN')
         message = alert.get('message', 'Alert triggered')
         current_value = alert.get('current_value', 0)
-        
-        notification = f"[{priority}] {symbol}: {message} (Current: {current_value})"
-        print(f"🚨 MARKET ALERT: {notification}")
-    
+
+        return f"🚨 MARKET ALERT: [{priority}] {symbol}: {message} (Current: {current_value})"
+
+    def _console_batch_handler(self, alerts: List[Dict]):
+        """Write one tick's console notifications in a single stdout call"""
+        lines = [self._format_console_notification(alert) for alert in alerts]
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+    def _log_batch_handler(self, alerts: List[Dict]):
+        """Append one tick's log entries in a single extend"""
+        self.alert_log.extend(self._format_log_entry(alert) for alert in alerts)
+
+    def _format_log_entry(self, alert: Dict) -> str:
+        """Format one alert as a log entry"""
+        # Reuse the tick timestamp already on the alert rather than reading
+        # the clock again for every notification
+        triggered_at = alert.get('triggered_at')
+        if triggered_at:
+            timestamp = triggered_at[:19].replace('T', ' ')
+        else:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return f"{timestamp} - Alert triggered: {alert}"
+
+    def _console_notification_handler(self, alert: Dict):
+        """Default console notification handler (single alert)"""
+        print(self._format_console_notification(alert))
+
     def _log_notification_handler(self, alert: Dict):
-        """Log notification handler"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"{timestamp} - Alert triggered: {alert}"
-        
+        """Log notification handler (single alert)"""
         # In a real implementation, this would write to a log file
         # For demo purposes, we'll just store in memory
-        if not hasattr(self, 'alert_log'):
-            self.alert_log = []
-        self.alert_log.append(log_entry)
-    
-    def add_notification_handler(self, handler: Callable):
-        """Add a custom notification handler"""
+        self.alert_log.append(self._format_log_entry(alert))
+
+    def add_notification_handler(self, handler: Callable, batch: bool = False):
+        """Add a custom notification handler
+
+        Args:
+            handler: Callable receiving one alert dict, or the whole list
+                of a tick's triggered alerts when batch=True
+            batch: Whether the handler accepts a list of alerts
+        """
         self.notification_handlers.append(handler)
+        if batch:
+            self._batch_handlers.append(handler)
+        else:
+            # Legacy single-alert handlers get a looping shim
+            def _shim(alerts, _handler=handler):
+                for alert in alerts:
+                    _handler(alert)
+            self._batch_handlers.append(_shim)
+        self._handlers_tuple = tuple(self._batch_handlers)
     
     def generate_recommendations(self, market_data: List[Dict], ai_analysis: Dict) -> List[Dict]:
         """
@@ -381,14 +716,36 @@ class AlertsEngine:
         Returns:
             List of recommendation dictionaries
         """
-        recommendations = []
-        timestamp = datetime.now().isoformat()
-        
-        # Market-level recommendations
+        # One symbol -> data index instead of an O(N*M) nested scan below
+        data_by_symbol = {data.get('symbol'): data for data in market_data}
+
         market_overview = ai_analysis.get('market_overview', {})
         market_sentiment = market_overview.get('sentiment', 'neutral')
         average_change = market_overview.get('average_change', 0)
-        
+        individual_analyses = ai_analysis.get('individual_analysis', [])
+        risk_assessment = ai_analysis.get('risk_assessment', {})
+        overall_risk = risk_assessment.get('overall_risk_level', 'medium')
+
+        # Fingerprint every input the rules below read; when nothing moved
+        # since the last call, return the previous batch instead of
+        # re-running the whole symbol match loop
+        analysis_hash = hash((
+            market_sentiment,
+            round(average_change, 2),
+            overall_risk,
+            tuple(sorted(data_by_symbol)),
+            tuple((analysis.get('symbol'), analysis.get('trend_direction'),
+                   analysis.get('risk_level'),
+                   round(analysis.get('sentiment_score', 0.5), 2))
+                  for analysis in individual_analyses)
+        ))
+        if analysis_hash == self._last_reco_hash:
+            return self._last_recommendations
+
+        recommendations = []
+        timestamp = datetime.now().isoformat()
+
+        # Market-level recommendations
         if market_sentiment == 'bullish' and average_change > 3:
             recommendations.append({
                 'type': 'market_strategy',
@@ -409,7 +766,6 @@ class AlertsEngine:
             })
         
         # Asset-specific recommendations
-        individual_analyses = ai_analysis.get('individual_analysis', [])
         for analysis in individual_analyses:
             symbol = analysis.get('symbol', 'UNKNOWN')
             trend_direction = analysis.get('trend_direction', 'neutral')
@@ -417,12 +773,8 @@ class AlertsEngine:
             sentiment_score = analysis.get('sentiment_score', 0.5)
             
             # Find corresponding market data
-            asset_data = None
-            for data in market_data:
-                if data.get('symbol') == symbol:
-                    asset_data = data
-                    break
-            
+            asset_data = data_by_symbol.get(symbol)
+
             if not asset_data:
                 continue
             
@@ -473,9 +825,6 @@ class AlertsEngine:
                 })
         
         # Risk management recommendations
-        risk_assessment = ai_analysis.get('risk_assessment', {})
-        overall_risk = risk_assessment.get('overall_risk_level', 'medium')
-        
         if overall_risk == 'high':
             recommendations.append({
                 'type': 'risk_management',
@@ -486,9 +835,14 @@ class AlertsEngine:
                 'priority': 'high'
             })
         
-        # Cache recommendations
+        # Cache recommendations, evicting the oldest batch past the bound
         self.recommendation_cache[timestamp] = recommendations
-        
+        if len(self.recommendation_cache) > _RECOMMENDATION_CACHE_SIZE:
+            self.recommendation_cache.popitem(last=False)
+
+        self._last_reco_hash = analysis_hash
+        self._last_recommendations = recommendations
+
         return recommendations
     
     def start_monitoring(self, data_source_func: Callable, ai_analysis_func: Callable):
@@ -502,53 +856,72 @@ class AlertsEngine:
         if self.is_monitoring:
             print("Monitoring already active")
             return
-        
-        self.is_monitoring = True
-        
+
+        self._stop_event.clear()
+        self._tick_event.clear()
+
         def monitor_loop():
             print(f"Starting market monitoring (checking every {self.check_interval} seconds)")
-            
-            while self.is_monitoring:
+
+            while not self._stop_event.is_set():
                 try:
                     # Get current market data
                     market_data = data_source_func()
-                    
+
                     if market_data:
                         # Check alerts
                         triggered_alerts = self.check_alerts(market_data)
-                        
+
                         # Generate AI analysis and recommendations
                         if triggered_alerts or len(self.recommendation_cache) == 0:
                             ai_analysis = ai_analysis_func(market_data)
                             recommendations = self.generate_recommendations(market_data, ai_analysis)
-                            
+
                             if recommendations:
                                 print(f"Generated {len(recommendations)} new recommendations")
-                    
+
                 except Exception as e:
                     print(f"Error in monitoring loop: {str(e)}")
-                
-                # Wait before next check
-                time.sleep(self.check_interval)
-        
+
+                # Wait for the next tick: wakes early if notify_tick or
+                # stop_monitoring fires, instead of an uninterruptible sleep
+                self._tick_event.wait(timeout=self.check_interval)
+                self._tick_event.clear()
+
         # Start monitoring in separate thread
         self.monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
         self.monitor_thread.start()
-    
+
+    @property
+    def is_monitoring(self) -> bool:
+        """Whether the monitor thread is currently running"""
+        return (self.monitor_thread is not None
+                and self.monitor_thread.is_alive()
+                and not self._stop_event.is_set())
+
+    def notify_tick(self):
+        """Wake the monitor loop immediately (e.g. when fresh data arrives)"""
+        self._tick_event.set()
+
     def stop_monitoring(self):
         """Stop continuous monitoring"""
         if self.is_monitoring:
-            self.is_monitoring = False
+            self._stop_event.set()
+            self._tick_event.set()
+            self.monitor_thread.join(timeout=5)
+            self._notify_q.join()  # flush any queued notifications
             print("Market monitoring stopped")
     
     def get_recent_recommendations(self, limit: int = 10) -> List[Dict]:
         """Get recent recommendations"""
+        # Insertion order is timestamp order, so walk newest-first directly
+        # instead of sorting the whole cache on every read
         all_recommendations = []
-        for timestamp, recs in sorted(self.recommendation_cache.items(), reverse=True):
+        for recs in reversed(self.recommendation_cache.values()):
             all_recommendations.extend(recs)
             if len(all_recommendations) >= limit:
                 break
-        
+
         return all_recommendations[:limit]
     
     def clear_cache(self):
@@ -3,17 +3,174 @@ Market Mirror - Data Ingestion Module
 Handles data collection from various market APIs with caching and rate limiting.
 """
 
+import asyncio
+import hashlib
 import json
+import textwrap
 import time
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, List, Optional, Union
 import urllib.request
 import urllib.parse
 
+import numpy as np
+
+try:
+    import orjson  # ~3-10x faster than json and serializes numpy natively
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import urllib3  # pooled, thread-safe HTTP connections with retries
+except ImportError:  # pragma: no cover - optional speedup
+    urllib3 = None
+
+try:
+    import aiohttp  # async HTTP client for concurrent symbol fetches
+except ImportError:  # pragma: no cover - optional speedup
+    aiohttp = None
+
+try:
+    import ijson  # streaming JSON parser for large API payloads
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
+
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:  # Numba is optional - fall back to pure Python
+    _HAVE_NUMBA = False
+    prange = range
+
 class DataIngestionError(Exception):
     """Custom exception for data ingestion errors"""
     pass
 
+def _stable_seed(key: str) -> int:
+    """Deterministic 64-bit PRNG seed, independent of PYTHONHASHSEED"""
+    return int.from_bytes(
+        hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+
+if _HAVE_NUMBA:
+    @njit('f4[:, :](u8[:], f8[:], i8, f8)', cache=True, boundscheck=False,
+          nogil=True, parallel=True)
+    def _price_walk_kernel(seeds, base_prices, n_days, volatility):
+        """Fused random-walk kernel: one row of prices per seed.
+
+        The uniform draw, (1 + change) step and running product are fused
+        into a single loop with no intermediate arrays; rows are
+        independent so the basket parallelizes across cores. An inline
+        splitmix64 generator makes each row's stream a pure function of
+        its seed. No fastmath: FP reassociation/FMA would break the
+        bit-identity contract with the pure-Python fallback below.
+        """
+        out = np.empty((len(seeds), n_days), dtype=np.float32)
+        for i in prange(len(seeds)):
+            state = seeds[i]
+            price = base_prices[i]
+            for day in range(n_days):
+                state = (state + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+                z = state
+                z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+                z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+                z ^= z >> 31
+                change = (2.0 * (z / 1.8446744073709552e19) - 1.0) * volatility
+                price = price * (1.0 + change)
+                out[i, day] = price
+        return out
+else:
+    def _price_walk_kernel(seeds, base_prices, n_days, volatility):
+        """Pure-Python splitmix64 walk, bit-identical to the jitted kernel.
+
+        Python ints are arbitrary precision, so the explicit masks provide
+        the uint64 wraparound the jitted version gets for free.
+        """
+        out = np.empty((len(seeds), n_days), dtype=np.float32)
+        for i in range(len(seeds)):
+            state = int(seeds[i])
+            price = float(base_prices[i])
+            for day in range(n_days):
+                state = (state + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+                z = state
+                z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+                z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+                z ^= z >> 31
+                change = (2.0 * (z / 1.8446744073709552e19) - 1.0) * volatility
+                price = price * (1.0 + change)
+                out[i, day] = price
+        return out
+
+def _price_walk(symbol: str, base_price: float, n: int, volatility: float) -> 'np.ndarray':
+    """Deterministic price walk for one symbol via the batch kernel"""
+    return _price_walk_kernel(
+        np.array([_stable_seed(symbol)], dtype=np.uint64),
+        np.array([base_price]), n, volatility)[0]
+
+# One (timestamp, price) point of a streamed price history
+_PRICE_POINT_DTYPE = np.dtype([('timestamp', 'i8'), ('price', 'f8')])
+
+def _parse_history_stream(stream) -> tuple:
+    """Stream-parse a CoinGecko-style ``{"prices": [[ts, price], ...]}`` body.
+
+    Real 3m histories run to multiple MB while only two fields per point
+    matter, so with ijson the points go straight from the parser into a
+    structured numpy array via np.fromiter - the full object tree is never
+    materialized. ``stream`` is any file-like body (e.g. an HTTP response
+    from _fetch_url wrapped in io.BytesIO, or urllib3's streamed response).
+    Returns (timestamps, prices) arrays.
+    """
+    if ijson is not None:
+        points = np.fromiter(
+            ((int(ts), float(price))
+             for ts, price in ijson.items(stream, 'prices.item')),
+            dtype=_PRICE_POINT_DTYPE)
+    else:
+        payload = json.loads(stream.read())
+        points = np.array([(int(ts), float(price))
+                           for ts, price in payload['prices']],
+                          dtype=_PRICE_POINT_DTYPE)
+    return points['timestamp'], points['price']
+
+# Internal per-item keys that must never reach a JSON payload: the
+# columnar history mirror built at generation time, and the processor's
+# _HistoryArrays scratch attached downstream
+_INTERNAL_ITEM_KEYS = ('history_columns', '_hist_arr')
+
+def results_to_json_bytes(results: List[Dict]) -> bytes:
+    """JSON-encode fetch results for the API boundary.
+
+    JSON serialization tends to dominate response time for multi-symbol
+    histories, so this goes through orjson when it is installed and falls
+    back to compact stdlib json otherwise. Internal columnar/scratch keys
+    are dropped from the payload.
+    """
+    payload = [{key: value for key, value in data.items()
+                if key not in _INTERNAL_ITEM_KEYS}
+               for data in results]
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+@lru_cache(maxsize=1024)
+def _product_static(product_id: str) -> tuple:
+    """Rating and review count depend only on the product id, not the
+    duration, so hash them once per product instead of on every fetch"""
+    rating = 4.0 + (_stable_seed(f"rating{product_id}") % 10) / 10  # 4.0-4.9 rating
+    review_count = (_stable_seed(f"reviews{product_id}") % 10000) + 100
+    return rating, review_count
+
+def _columns_to_rows(columns: Dict[str, 'np.ndarray']) -> List[Dict]:
+    """Materialize columnar history into per-row dicts once, at the boundary"""
+    keys = tuple(columns)
+    cols = [col.tolist() if isinstance(col, np.ndarray) else col
+            for col in columns.values()]
+    return [dict(zip(keys, row)) for row in zip(*cols)]
+
 class MarketDataIngestion:
     """
     Unified data ingestion class supporting multiple market types:
@@ -22,24 +179,98 @@ class MarketDataIngestion:
     - E-commerce (Mock data)
     """
     
+    # Shared lookup tables, built once at class creation instead of being
+    # re-allocated inside every generator call. MappingProxyType makes them
+    # read-only views so nothing can mutate them behind the generators' backs.
+    _DURATION_DAYS = MappingProxyType({'1d': 1, '7d': 7, '1m': 30, '3m': 90})
+
+    _BASE_STOCK_PRICES = MappingProxyType({
+        'AAPL': 190.50,
+        'GOOGL': 140.30,
+        'MSFT': 350.75,
+        'TSLA': 245.80,
+        'AMZN': 180.25
+    })
+
+    _BASE_CRYPTO_PRICES = MappingProxyType({
+        'BTC': 65000.0,
+        'ETH': 3200.0,
+        'SOL': 180.0,
+        'ADA': 0.45,
+        'DOT': 7.50
+    })
+
+    _BASE_PRODUCTS = MappingProxyType({
+        'iPhone15': {'name': 'iPhone 15 Pro', 'base_price': 999.0, 'category': 'Electronics'},
+        'AirPods': {'name': 'AirPods Pro', 'base_price': 249.0, 'category': 'Audio'},
+        'MacBook': {'name': 'MacBook Air M2', 'base_price': 1199.0, 'category': 'Computers'},
+        'iPad': {'name': 'iPad Pro', 'base_price': 799.0, 'category': 'Tablets'},
+        'Watch': {'name': 'Apple Watch Ultra', 'base_price': 799.0, 'category': 'Wearables'}
+    })
+
     def __init__(self):
-        self.cache = {}
-        self.cache_ttl = 300  # 5 minutes cache
+        self.cache = OrderedDict()  # LRU order: oldest entries first
+        self.cache_max = 1024  # entries kept before LRU eviction
+        self.cache_ttl = 300  # 5 minutes fresh window
+        # Stale-while-revalidate: entries older than cache_ttl but younger
+        # than stale_ttl are served immediately while a background refresh
+        # replaces them, so nobody pays the regeneration cost at the TTL edge
+        self.stale_ttl = 1800
+        self._refresh_pool = ThreadPoolExecutor(max_workers=2)
+        self._refreshing = set()  # cache keys with an in-flight refresh
+        self._refresh_lock = threading.Lock()
+        # Single-flight registry for cold-cache fetches: cache key -> Future
+        # of the generating thread, so concurrent callers share one result
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
         self.rate_limit_delay = 1  # 1 second between requests
-        self.last_request_time = 0
-        
+        # Monotonic timestamps for TTL and throttling: unlike time.time()
+        # they never jump on NTP adjustment, so a clock step can't hang the
+        # rate limiter or keep a cache entry valid forever
+        self._last_request_mono = 0
+        # Mock generation has no external API to protect, so throttling is
+        # off by default; flip this on when wiring in real endpoints
+        self.rate_limit_enabled = False
+        self._rate_lock = threading.Lock()
+        # Batch generators specialized per (market_type, duration),
+        # compiled lazily on first use
+        self._specialized = {}
+        # aiohttp sessions cached per event loop (see _aio_session)
+        self._aio_sessions = {}
+        # Reused HTTP session for the eventual real API path: connection
+        # pooling skips the per-request TCP/TLS handshake. urllib3 is
+        # thread-safe, so the pool is shared with the fetch executor; the
+        # urllib.request fallback still reuses one opener.
+        if urllib3 is not None:
+            self._http = urllib3.PoolManager(
+                num_pools=4, maxsize=16,
+                retries=urllib3.Retry(3, backoff_factor=0.3))
+        else:
+            self._http = None
+            self._opener = urllib.request.build_opener()
+
+    def _fetch_url(self, url: str, timeout: float = 10.0) -> bytes:
+        """GET a URL through the pooled session and return the body"""
+        if self._http is not None:
+            return self._http.request('GET', url, timeout=timeout).data
+        with self._opener.open(url, timeout=timeout) as response:
+            return response.read()
+
     def _rate_limit(self):
         """Implement rate limiting between API calls"""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = time.time()
+        if not self.rate_limit_enabled:
+            return
+        # Serialize check-and-update so concurrent fetches can't both read
+        # a stale _last_request_mono and skip the delay
+        with self._rate_lock:
+            elapsed = time.monotonic() - self._last_request_mono
+            if elapsed < self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay - elapsed)
+            self._last_request_mono = time.monotonic()
     
-    def _get_cache_key(self, market_type: str, symbols: List[str], duration: str) -> str:
-        """Generate cache key for request"""
-        symbols_str = ','.join(sorted(symbols))
-        return f"{market_type}:{symbols_str}:{duration}"
+    def _get_cache_key(self, market_type: str, symbol: str, duration: str):
+        """Generate the per-symbol cache key"""
+        return (market_type, symbol, duration)
     
     def _is_cache_valid(self, cache_key: str) -> bool:
         """Check if cached data is still valid"""
@@ -47,154 +278,139 @@ class MarketDataIngestion:
             return False
         
         cache_time = self.cache[cache_key]['timestamp']
-        return (time.time() - cache_time) < self.cache_ttl
+        return (time.monotonic() - cache_time) < self.cache_ttl
     
-    def _generate_mock_stock_data(self, symbol: str, duration: str) -> Dict:
+    def _generate_mock_stock_data(self, symbol: str, dates: List[str],
+                                  last_updated: str) -> Dict:
         """Generate mock stock data for demonstration"""
-        base_prices = {
-            'AAPL': 190.50,
-            'GOOGL': 140.30,
-            'MSFT': 350.75,
-            'TSLA': 245.80,
-            'AMZN': 180.25
+        base_price = self._BASE_STOCK_PRICES.get(symbol, 100.0)
+
+        # One vectorized batch: a single seeded draw and cumulative product
+        # replace the per-day Python loop; dates are precomputed per fetch
+        n = len(dates)
+
+        # -5% to +5% daily random walk, fused into the jitted kernel.
+        # float32 is plenty for display precision and halves memory traffic
+        closes = _price_walk(symbol, base_price, n, 0.05)
+        rng = np.random.default_rng(_stable_seed(symbol))
+        opens = closes * 0.999
+        highs = closes * 1.02
+        lows = closes * 0.98
+        volumes = rng.integers(1_000_000, 11_000_000, n, dtype=np.int32)
+
+        # Keep the history as contiguous columns; per-row dicts are
+        # materialized once for the pipeline boundary
+        columns = {
+            'date': np.array(dates),
+            'open': opens,
+            'high': highs,
+            'low': lows,
+            'close': closes,
+            'volume': volumes
         }
-        
-        base_price = base_prices.get(symbol, 100.0)
-        
-        # Generate historical data points
-        days = {'1d': 1, '7d': 7, '1m': 30, '3m': 90}.get(duration, 7)
-        history = []
-        
-        current_price = base_price
-        for i in range(days, -1, -1):
-            date = datetime.now() - timedelta(days=i)
-            # Simulate price movement with random walk
-            change_pct = (hash(f"{symbol}{date.date()}") % 1000) / 10000 - 0.05  # -5% to +5%
-            current_price *= (1 + change_pct)
-            
-            history.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'open': current_price * 0.999,
-                'high': current_price * 1.02,
-                'low': current_price * 0.98,
-                'close': current_price,
-                'volume': abs(hash(f"{symbol}{date}") % 10000000) + 1000000
-            })
-        
-        latest = history[-1]
-        previous = history[-2] if len(history) > 1 else history[-1]
-        
+
+        latest_close = float(closes[-1])
+        previous_close = float(closes[-2]) if n > 1 else latest_close
+
         return {
             'symbol': symbol,
             'name': f"{symbol} Inc.",
-            'current_price': latest['close'],
-            'price_change': latest['close'] - previous['close'],
-            'price_change_percentage': ((latest['close'] - previous['close']) / previous['close']) * 100,
-            'market_cap': latest['close'] * 1000000000,  # Mock market cap
-            'volume': latest['volume'],
-            'high_24h': max(h['high'] for h in history[-2:]),
-            'low_24h': min(h['low'] for h in history[-2:]),
-            'history': history,
-            'last_updated': datetime.now().isoformat()
+            'current_price': latest_close,
+            'price_change': latest_close - previous_close,
+            'price_change_percentage': ((latest_close - previous_close) / previous_close) * 100,
+            'market_cap': latest_close * 1000000000,  # Mock market cap
+            'volume': int(volumes[-1]),
+            'high_24h': float(highs[-2:].max()),
+            'low_24h': float(lows[-2:].min()),
+            'history': _columns_to_rows(columns),
+            'history_columns': columns,
+            'last_updated': last_updated
         }
     
-    def _generate_mock_crypto_data(self, symbol: str, duration: str) -> Dict:
+    def _generate_mock_crypto_data(self, symbol: str, dates: List[str],
+                                   last_updated: str) -> Dict:
         """Generate mock cryptocurrency data for demonstration"""
-        base_prices = {
-            'BTC': 65000.0,
-            'ETH': 3200.0,
-            'SOL': 180.0,
-            'ADA': 0.45,
-            'DOT': 7.50
+        base_price = self._BASE_CRYPTO_PRICES.get(symbol, 1.0)
+
+        # Generate historical data points in one vectorized batch
+        n = len(dates)
+
+        # crypto tends to be more volatile: +/-10% daily, via the jitted kernel
+        prices = _price_walk(symbol, base_price, n, 0.10)
+        rng = np.random.default_rng(_stable_seed(symbol))
+        volumes = rng.integers(10_000_000, 1_010_000_000, n, dtype=np.int32)
+
+        columns = {
+            'date': np.array(dates),
+            'price': prices,
+            'volume': volumes
         }
-        
-        base_price = base_prices.get(symbol, 1.0)
-        
-        # Generate historical data points
-        days = {'1d': 1, '7d': 7, '1m': 30, '3m': 90}.get(duration, 7)
-        history = []
-        
-        current_price = base_price
-        for i in range(days, -1, -1):
-            date = datetime.now() - timedelta(days=i)
-            # Crypto tends to be more volatile
-            change_pct = (hash(f"{symbol}{date.date()}") % 2000) / 10000 - 0.1  # -10% to +10%
-            current_price *= (1 + change_pct)
-            
-            history.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'price': current_price,
-                'volume': abs(hash(f"{symbol}{date}") % 1000000000) + 10000000
-            })
-        
-        latest = history[-1]
-        previous = history[-2] if len(history) > 1 else history[-1]
-        
+
+        latest_price = float(prices[-1])
+        previous_price = float(prices[-2]) if n > 1 else latest_price
+
         return {
             'symbol': symbol,
             'name': f"{symbol} Token",
-            'current_price': latest['price'],
-            'price_change': latest['price'] - previous['price'],
-            'price_change_percentage': ((latest['price'] - previous['price']) / previous['price']) * 100,
-            'market_cap': latest['price'] * 21000000,  # Mock circulating supply
-            'volume': latest['volume'],
-            'high_24h': max(h['price'] for h in history[-2:]) * 1.05,
-            'low_24h': min(h['price'] for h in history[-2:]) * 0.95,
-            'history': history,
-            'last_updated': datetime.now().isoformat()
+            'current_price': latest_price,
+            'price_change': latest_price - previous_price,
+            'price_change_percentage': ((latest_price - previous_price) / previous_price) * 100,
+            'market_cap': latest_price * 21000000,  # Mock circulating supply
+            'volume': int(volumes[-1]),
+            'high_24h': float(prices[-2:].max()) * 1.05,
+            'low_24h': float(prices[-2:].min()) * 0.95,
+            'history': _columns_to_rows(columns),
+            'history_columns': columns,
+            'last_updated': last_updated
         }
     
-    def _generate_mock_ecommerce_data(self, product_id: str, duration: str) -> Dict:
+    def _generate_mock_ecommerce_data(self, product_id: str, dates: List[str],
+                                      last_updated: str) -> Dict:
         """Generate mock e-commerce product data for demonstration"""
-        base_products = {
-            'iPhone15': {'name': 'iPhone 15 Pro', 'base_price': 999.0, 'category': 'Electronics'},
-            'AirPods': {'name': 'AirPods Pro', 'base_price': 249.0, 'category': 'Audio'},
-            'MacBook': {'name': 'MacBook Air M2', 'base_price': 1199.0, 'category': 'Computers'},
-            'iPad': {'name': 'iPad Pro', 'base_price': 799.0, 'category': 'Tablets'},
-            'Watch': {'name': 'Apple Watch Ultra', 'base_price': 799.0, 'category': 'Wearables'}
-        }
-        
-        product = base_products.get(product_id, {'name': f'Product {product_id}', 'base_price': 99.0, 'category': 'General'})
+        product = self._BASE_PRODUCTS.get(product_id)
+        if product is None:
+            product = {'name': f'Product {product_id}', 'base_price': 99.0, 'category': 'General'}
         base_price = product['base_price']
-        
-        # Generate pricing history
-        days = {'1d': 1, '7d': 7, '1m': 30, '3m': 90}.get(duration, 7)
-        history = []
-        
-        current_price = base_price
-        for i in range(days, -1, -1):
-            date = datetime.now() - timedelta(days=i)
-            # E-commerce prices are more stable but can have promotions
-            change_pct = (hash(f"{product_id}{date.date()}") % 200) / 10000 - 0.01  # -1% to +1%
-            # Occasionally simulate bigger discounts (sales events)
-            if hash(f"sale{product_id}{date.date()}") % 100 < 5:  # 5% chance of sale
-                change_pct = -0.15  # 15% discount
-            
-            current_price = max(current_price * (1 + change_pct), base_price * 0.7)  # Min 30% off
-            
-            history.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'price': current_price,
-                'sales_volume': abs(hash(f"{product_id}{date}") % 1000) + 50,
-                'availability': 'In Stock' if hash(f"stock{product_id}{date}") % 10 > 1 else 'Limited Stock'
-            })
-        
-        latest = history[-1]
-        previous = history[-2] if len(history) > 1 else history[-1]
-        
+
+        # Generate pricing history in one vectorized batch
+        n = len(dates)
+
+        rng = np.random.default_rng(_stable_seed(product_id))
+        # E-commerce prices are more stable but can have promotions:
+        # -1% to +1% daily, with a 5% chance of a 15% sale discount
+        changes = rng.uniform(-0.01, 0.01, n)
+        changes = np.where(rng.random(n) < 0.05, -0.15, changes)
+        # Clip the walk at 30% off the base price
+        prices = np.maximum(base_price * np.cumprod((1.0 + changes).astype(np.float32)),
+                            np.float32(base_price * 0.7))
+        sales_volumes = rng.integers(50, 1050, n, dtype=np.int32)
+        availability = np.where(rng.integers(0, 10, n) > 1, 'In Stock', 'Limited Stock')
+
+        columns = {
+            'date': np.array(dates),
+            'price': prices,
+            'sales_volume': sales_volumes,
+            'availability': availability
+        }
+
+        latest_price = float(prices[-1])
+        previous_price = float(prices[-2]) if n > 1 else latest_price
+        average_rating, review_count = _product_static(product_id)
+
         return {
             'product_id': product_id,
             'name': product['name'],
             'category': product['category'],
-            'current_price': latest['price'],
-            'price_change': latest['price'] - previous['price'],
-            'price_change_percentage': ((latest['price'] - previous['price']) / previous['price']) * 100,
-            'sales_volume': latest['sales_volume'],
-            'availability': latest['availability'],
-            'average_rating': 4.0 + (hash(f"rating{product_id}") % 10) / 10,  # 4.0-4.9 rating
-            'review_count': abs(hash(f"reviews{product_id}") % 10000) + 100,
-            'history': history,
-            'last_updated': datetime.now().isoformat()
+            'current_price': latest_price,
+            'price_change': latest_price - previous_price,
+            'price_change_percentage': ((latest_price - previous_price) / previous_price) * 100,
+            'sales_volume': int(sales_volumes[-1]),
+            'availability': str(availability[-1]),
+            'average_rating': average_rating,
+            'review_count': review_count,
+            'history': _columns_to_rows(columns),
+            'history_columns': columns,
+            'last_updated': last_updated
         }
     
     def fetch_market_data(self, market_type: str, symbols: List[str], duration: str) -> List[Dict]:
@@ -209,43 +425,210 @@ class MarketDataIngestion:
         Returns:
             List of market data dictionaries
         """
-        cache_key = self._get_cache_key(market_type, symbols, duration)
-        
-        # Check cache first
-        if self._is_cache_valid(cache_key):
-            print(f"Returning cached data for {cache_key}")
-            return self.cache[cache_key]['data']
-        
-        print(f"Fetching fresh data for {market_type}: {symbols} ({duration})")
-        
-        # Apply rate limiting
-        self._rate_limit()
-        
-        try:
-            results = []
-            
-            for symbol in symbols:
-                if market_type == 'stocks':
-                    data = self._generate_mock_stock_data(symbol, duration)
-                elif market_type == 'crypto':
-                    data = self._generate_mock_crypto_data(symbol, duration)
-                elif market_type == 'ecommerce':
-                    data = self._generate_mock_ecommerce_data(symbol, duration)
+        # Check the cache per symbol: a basket only regenerates the symbols
+        # it is actually missing. Fresh entries are used directly, stale
+        # (but not expired) ones are used while a background refresh runs.
+        now_ts = time.monotonic()
+        data_by_symbol = {}
+        missing = []
+        stale = []
+        for symbol in symbols:
+            cache_key = self._get_cache_key(market_type, symbol, duration)
+            entry = self.cache.get(cache_key)
+            if entry is None or now_ts - entry['timestamp'] >= self.stale_ttl:
+                missing.append(symbol)
+                continue
+            self.cache.move_to_end(cache_key)  # refresh LRU position
+            data_by_symbol[symbol] = entry['data']
+            if now_ts - entry['timestamp'] >= self.cache_ttl:
+                stale.append(symbol)
+
+        if stale:
+            self._schedule_refresh(market_type, stale, duration)
+            print(f"Returning stale data for {market_type}: {stale} ({duration}), refreshing in background")
+
+        if not missing:
+            if not stale:
+                print(f"Returning cached data for {market_type}: {symbols} ({duration})")
+            return [data_by_symbol[symbol] for symbol in symbols]
+
+        # Single-flight: claim a Future per missing symbol. Symbols another
+        # thread is already generating are awaited instead of recomputed -
+        # wasted work today and a rate-limit hazard against a real API.
+        owned = []
+        awaited = []
+        with self._inflight_lock:
+            for symbol in missing:
+                cache_key = self._get_cache_key(market_type, symbol, duration)
+                future = self._inflight.get(cache_key)
+                if future is None:
+                    future = Future()
+                    self._inflight[cache_key] = future
+                    owned.append((symbol, future))
                 else:
-                    raise DataIngestionError(f"Unsupported market type: {market_type}")
-                
-                results.append(data)
-            
-            # Cache the results
-            self.cache[cache_key] = {
-                'data': results,
-                'timestamp': time.time()
-            }
-            
-            return results
-            
+                    awaited.append((symbol, future))
+
+        if owned:
+            owned_symbols = [symbol for symbol, _ in owned]
+            print(f"Fetching fresh data for {market_type}: {owned_symbols} ({duration})")
+
+            # Apply rate limiting
+            self._rate_limit()
+
+            try:
+                fresh = self._generate_results(market_type, owned_symbols, duration)
+            except Exception as e:
+                error = DataIngestionError(f"Failed to fetch market data: {str(e)}")
+                with self._inflight_lock:
+                    for symbol, future in owned:
+                        del self._inflight[
+                            self._get_cache_key(market_type, symbol, duration)]
+                for _, future in owned:
+                    future.set_exception(error)
+                raise error
+
+            for (symbol, future), data in zip(owned, fresh):
+                self._store_cache_entry(
+                    self._get_cache_key(market_type, symbol, duration), data)
+                data_by_symbol[symbol] = data
+                future.set_result(data)
+            with self._inflight_lock:
+                for symbol, _ in owned:
+                    del self._inflight[
+                        self._get_cache_key(market_type, symbol, duration)]
+
+        for symbol, future in awaited:
+            data_by_symbol[symbol] = future.result()
+
+        return [data_by_symbol[symbol] for symbol in symbols]
+
+    async def fetch_market_data_async(self, market_type: str, symbols: List[str],
+                                      duration: str) -> List[Dict]:
+        """Async entry point for fetch_market_data.
+
+        The current backend is local: symbols are generated in one batch
+        that already fans out across a thread pool with single-flight
+        dedup, so the fastest shape is a single blocking call moved off
+        the event loop. When real HTTP providers land, this is where the
+        per-symbol requests switch to an aiohttp.ClientSession (see
+        _aio_session) gathered under an asyncio.Semaphore instead.
+        """
+        return await asyncio.to_thread(
+            self.fetch_market_data, market_type, symbols, duration)
+
+    def _aio_session(self) -> 'aiohttp.ClientSession':
+        """Shared pooled aiohttp session for the real-API async path.
+
+        Cached per event loop so repeated analyze commands in one
+        interactive session reuse warm connections (no per-call DNS or
+        TLS handshakes) instead of building a new connector each time.
+        """
+        if aiohttp is None:
+            raise DataIngestionError("aiohttp is not installed")
+        loop = asyncio.get_running_loop()
+        session = self._aio_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, limit_per_host=8,
+                                               ttl_dns_cache=300,
+                                               keepalive_timeout=30))
+            self._aio_sessions[loop] = session
+        return session
+
+    async def close_aio_sessions(self) -> None:
+        """Close the aiohttp session bound to the running loop, if any"""
+        session = self._aio_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _generate_results(self, market_type: str, symbols: List[str], duration: str) -> List[Dict]:
+        """Generate data for every symbol in the batch"""
+        key = (market_type, duration)
+        batch = self._specialized.get(key)
+        if batch is None:
+            batch = self._build_batch_generator(market_type, duration)
+            self._specialized[key] = batch
+        return batch(symbols)
+
+    # Template for the specialized batch generators: the generator callable
+    # and the day count are baked in at compile time, so the per-call body
+    # has no dispatch branch or duration lookup left. Dates and the update
+    # timestamp are identical for every symbol in the batch, so they are
+    # computed once per call; date.isoformat() is markedly faster than
+    # strftime for the same '%Y-%m-%d' output.
+    _BATCH_TEMPLATE = textwrap.dedent("""\
+        def _batch(symbols):
+            now = datetime.now()
+            base_date = now.date()
+            dates = [(base_date - timedelta(days=i)).isoformat()
+                     for i in range({days}, -1, -1)]
+            last_updated = now.isoformat()
+            # Symbols are independent and the numpy kernels release the
+            # GIL, so fan the batch out across a small thread pool
+            if len(symbols) > 1:
+                with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+                    return list(executor.map(
+                        lambda symbol: generate(symbol, dates, last_updated),
+                        symbols))
+            return [generate(symbol, dates, last_updated) for symbol in symbols]
+        """)
+
+    def _build_batch_generator(self, market_type: str, duration: str):
+        """Compile a batch generator specialized to one (market_type, duration)"""
+        generators = {
+            'stocks': self._generate_mock_stock_data,
+            'crypto': self._generate_mock_crypto_data,
+            'ecommerce': self._generate_mock_ecommerce_data
+        }
+        generate = generators.get(market_type)
+        if generate is None:
+            raise DataIngestionError(f"Unsupported market type: {market_type}")
+
+        namespace = {
+            'generate': generate,
+            'datetime': datetime,
+            'timedelta': timedelta,
+            'ThreadPoolExecutor': ThreadPoolExecutor
+        }
+        exec(compile(
+            self._BATCH_TEMPLATE.format(days=self._DURATION_DAYS.get(duration, 7)),
+            f'<batch generator {market_type}/{duration}>', 'exec'), namespace)
+        return namespace['_batch']
+
+    def _store_cache_entry(self, cache_key, data: Dict):
+        """Insert one symbol's data, evicting the LRU entry past the bound"""
+        self.cache[cache_key] = {
+            'data': data,
+            'timestamp': time.monotonic()
+        }
+        self.cache.move_to_end(cache_key)
+        if len(self.cache) > self.cache_max:
+            self.cache.popitem(last=False)
+
+    def _schedule_refresh(self, market_type: str, symbols: List[str], duration: str):
+        """Queue a background regeneration for stale symbols, deduplicated"""
+        with self._refresh_lock:
+            pending = [symbol for symbol in symbols
+                       if (market_type, symbol, duration) not in self._refreshing]
+            for symbol in pending:
+                self._refreshing.add((market_type, symbol, duration))
+        if pending:
+            self._refresh_pool.submit(
+                self._refresh_entries, market_type, pending, duration)
+
+    def _refresh_entries(self, market_type: str, symbols: List[str], duration: str):
+        """Regenerate stale cache entries and swap them in"""
+        try:
+            results = self._generate_results(market_type, symbols, duration)
+            for symbol, data in zip(symbols, results):
+                self._store_cache_entry(
+                    self._get_cache_key(market_type, symbol, duration), data)
         except Exception as e:
-            raise DataIngestionError(f"Failed to fetch market data: {str(e)}")
+            print(f"Background refresh failed for {market_type}: {symbols}: {str(e)}")
+        finally:
+            with self._refresh_lock:
+                for symbol in symbols:
+                    self._refreshing.discard((market_type, symbol, duration))
     
     def get_supported_symbols(self, market_type: str) -> List[str]:
         """Get list of supported symbols for a market type"""
@@ -4,14 +4,165 @@ Handles data cleaning, preprocessing, and aggregation using native Python.
 """
 
 import json
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Union
-import statistics
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - fall back to pure Python
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
 
 class DataProcessingError(Exception):
     """Custom exception for data processing errors"""
     pass
 
+# Computed-indicator sets kept before LRU eviction
+_PROCESSED_CACHE_SIZE = 1024
+
+# Strips currency symbols, thousands separators and spaces in one C pass
+_PRICE_TABLE = str.maketrans('', '', '$, \t\n\r')
+
+# Accepted date formats for the strptime fallback, in likelihood order
+_DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S',
+                 '%Y-%m-%dT%H:%M:%S.%f')
+
+class _HistoryArrays:
+    """Contiguous columnar view of one asset's cleaned history.
+
+    Built once per asset in clean_data so the indicator and anomaly passes
+    read three flat buffers instead of re-walking the history dicts. Only
+    points carrying a price (or close) are included; a missing volume is
+    NaN.
+    """
+    __slots__ = ('dates', 'price', 'volume')
+
+    def __init__(self, history: List[Dict]):
+        points = []
+        values = []
+        for point in history:
+            value = point.get('price')
+            if value is None:
+                value = point.get('close')
+            if value is not None:
+                points.append(point)
+                values.append(value)
+        self.dates = np.array([point['date'] for point in points],
+                              dtype='datetime64[D]')
+        self.price = np.asarray(values, dtype=np.float64)
+        self.volume = np.fromiter(
+            (point['volume'] if point.get('volume') is not None else np.nan
+             for point in points),
+            dtype=np.float64, count=len(points))
+
+@njit('UniTuple(f8, 8)(f8[:])', cache=True, boundscheck=False, nogil=True)
+def _indicator_kernel(prices):
+    """Fused tail-window indicator kernel: one jitted call, no temporaries.
+
+    Returns (sma_5, sma_10, sma_20, volatility, momentum_5d, rsi_14,
+    bb_upper, bb_lower); slots whose window exceeds the history are NaN.
+    Window means and sample stdevs use two-pass accumulation, matching
+    numpy's numerics, and the RSI is the flat mean over the last 13 ticks
+    like _calculate_rsi.
+    """
+    n = prices.shape[0]
+    sma_5 = np.nan
+    sma_10 = np.nan
+    sma_20 = np.nan
+    volatility = np.nan
+    momentum_5d = np.nan
+    rsi = np.nan
+    bb_upper = np.nan
+    bb_lower = np.nan
+
+    if n >= 5:
+        total = 0.0
+        for i in range(n - 5, n):
+            total += prices[i]
+        sma_5 = total / 5.0
+        momentum_5d = (prices[n - 1] - prices[n - 5]) / prices[n - 5] * 100.0
+
+    if n >= 10:
+        total = 0.0
+        for i in range(n - 10, n):
+            total += prices[i]
+        sma_10 = total / 10.0
+        sq = 0.0
+        for i in range(n - 10, n):
+            dev = prices[i] - sma_10
+            sq += dev * dev
+        volatility = np.sqrt(sq / 9.0)
+
+    if n >= 14:
+        gain = 0.0
+        loss = 0.0
+        for i in range(n - 13, n):
+            change = prices[i] - prices[i - 1]
+            if change > 0:
+                gain += change
+            else:
+                loss -= change
+        if loss == 0.0:
+            rsi = 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+
+    if n >= 20:
+        total = 0.0
+        for i in range(n - 20, n):
+            total += prices[i]
+        sma_20 = total / 20.0
+        sq = 0.0
+        for i in range(n - 20, n):
+            dev = prices[i] - sma_20
+            sq += dev * dev
+        std_20 = np.sqrt(sq / 19.0)
+        bb_upper = sma_20 + 2.0 * std_20
+        bb_lower = sma_20 - 2.0 * std_20
+
+    return sma_5, sma_10, sma_20, volatility, momentum_5d, rsi, bb_upper, bb_lower
+
+@njit('f8(f8[:], i8)', cache=True, boundscheck=False, nogil=True)
+def _rsi_wilder_loop(prices, period):
+    """Wilder-smoothed RSI over the full price series.
+
+    The smoothing recurrence avg = (avg * (n-1) + x) / n is inherently
+    sequential, so it lives in a jitted scalar loop rather than numpy;
+    cache=True keeps the compiled kernel across process starts.
+    """
+    n = prices.shape[0]
+    if n <= period:
+        return 50.0  # Neutral RSI
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        change = prices[i] - prices[i - 1]
+        if change > 0:
+            avg_gain += change
+        else:
+            avg_loss -= change
+    avg_gain /= period
+    avg_loss /= period
+
+    for i in range(period + 1, n):
+        change = prices[i] - prices[i - 1]
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+
+    if avg_loss == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
 class MarketDataProcessor:
     """
     Data processing class for cleaning, normalizing, and analyzing market data.
@@ -19,7 +170,7 @@ class MarketDataProcessor:
     """
     
     def __init__(self):
-        self.processed_cache = {}
+        self.processed_cache = OrderedDict()  # LRU order: oldest entries first
     
     def clean_data(self, raw_data: List[Dict]) -> List[Dict]:
         """
@@ -32,7 +183,10 @@ class MarketDataProcessor:
             List of cleaned market data dictionaries
         """
         cleaned_data = []
-        
+        # One timestamp per batch - sub-batch wall-clock precision is
+        # meaningless and datetime.now() is a syscall plus allocations
+        now_iso = datetime.now().isoformat()
+
         for item in raw_data:
             try:
                 # Validate required fields
@@ -40,13 +194,20 @@ class MarketDataProcessor:
                 if not all(field in item for field in required_fields):
                     print(f"Warning: Missing required fields in {item.get('symbol', 'unknown')}")
                     continue
-                
+
+                # Work on a copy: the caller's dicts may be owned by another
+                # layer's cache (the ingestion layer re-serves them), which
+                # must never see cleaned values or processor scratch keys
+                item = dict(item)
+
                 # Clean price data
                 item['current_price'] = self._clean_price(item['current_price'])
                 
-                # Clean historical data
+                # Clean historical data, keeping a columnar mirror for the
+                # downstream numpy passes
                 if 'history' in item and item['history']:
                     item['history'] = self._clean_historical_data(item['history'])
+                    item['_hist_arr'] = _HistoryArrays(item['history'])
                 
                 # Ensure numeric fields are properly typed
                 numeric_fields = ['price_change', 'price_change_percentage', 'volume', 'market_cap']
@@ -56,7 +217,7 @@ class MarketDataProcessor:
                 
                 # Add timestamp if missing
                 if 'last_updated' not in item:
-                    item['last_updated'] = datetime.now().isoformat()
+                    item['last_updated'] = now_iso
                 
                 cleaned_data.append(item)
                 
@@ -68,10 +229,19 @@ class MarketDataProcessor:
     
     def _clean_price(self, price: Union[str, int, float]) -> float:
         """Clean and validate price data"""
+        # Fast path: prices overwhelmingly arrive as plain floats already,
+        # so skip the string handling and exception frame entirely (exact
+        # type check - no MRO walk)
+        if type(price) is float:
+            if price > 0:
+                return round(price, 8)  # Round to 8 decimal places for crypto precision
+            raise DataProcessingError(f"Invalid price value: {price}")
+
         try:
             if isinstance(price, str):
-                # Remove currency symbols and commas
-                price = price.replace('$', '').replace(',', '').strip()
+                # Remove currency symbols, commas and whitespace in a
+                # single translate pass instead of three chained replaces
+                price = price.translate(_PRICE_TABLE)
             
             price_float = float(price)
             
@@ -96,8 +266,75 @@ class MarketDataProcessor:
         except (ValueError, TypeError):
             return None
     
+    # Recognized price columns, in output order
+    _PRICE_FIELDS = ('price', 'open', 'high', 'low', 'close')
+
+    def _clean_history_vectorized(self, history: List[Dict]) -> Optional[List[Dict]]:
+        """Vectorized fast path for _clean_historical_data.
+
+        Handles the common case of a uniform, numerically-typed history in
+        a few array ops with no per-point try/except frames. Returns None
+        whenever the input needs per-point care (mixed schemas, string
+        prices, invalid values), deferring to the slow path so drop/print
+        behavior there stays exactly as before.
+        """
+        first_keys = history[0].keys()
+        if 'date' not in first_keys:
+            return None
+        price_fields = [field for field in self._PRICE_FIELDS
+                        if field in first_keys]
+        if not price_fields:
+            return None
+        has_volume = 'volume' in first_keys
+
+        try:
+            if any(point.keys() != first_keys for point in history):
+                return None
+            dates = np.array([point['date'] for point in history],
+                             dtype='datetime64[D]')
+            mask = np.ones(len(history), dtype=bool)
+            columns = {}
+            for field in price_fields:
+                col = np.array([point[field] for point in history],
+                               dtype=np.float64)
+                mask &= np.isfinite(col) & (col > 0)
+                columns[field] = np.round(col, 8)
+            if has_volume:
+                columns['volume'] = np.array(
+                    [point['volume'] for point in history], dtype=np.float64)
+        except (KeyError, ValueError, TypeError):
+            return None
+
+        if not mask.all():
+            return None  # let the slow path drop and report bad points
+
+        order = np.argsort(dates, kind='stable')
+        date_strs = np.datetime_as_string(dates[order], unit='D').tolist()
+        column_lists = {field: col[order].tolist()
+                        for field, col in columns.items()}
+
+        # Normalize so downstream passes can read 'price' with one probe
+        normalize_price = 'price' not in price_fields and 'close' in price_fields
+
+        cleaned_history = []
+        for i, day in enumerate(date_strs):
+            cleaned_point = {'date': day}
+            for field in price_fields:
+                cleaned_point[field] = column_lists[field][i]
+            if has_volume:
+                cleaned_point['volume'] = column_lists['volume'][i]
+            if normalize_price:
+                cleaned_point['price'] = cleaned_point['close']
+            cleaned_history.append(cleaned_point)
+        return cleaned_history
+
     def _clean_historical_data(self, history: List[Dict]) -> List[Dict]:
         """Clean historical price data"""
+        if history:
+            cleaned_history = self._clean_history_vectorized(history)
+            if cleaned_history is not None:
+                return cleaned_history
+
         cleaned_history = []
         
         for point in history:
@@ -120,6 +357,10 @@ class MarketDataProcessor:
                 
                 # Only add if we have essential data
                 if 'date' in cleaned_point and any(field in cleaned_point for field in price_fields):
+                    # Normalize so downstream passes can read 'price'
+                    # with one probe
+                    if 'price' not in cleaned_point and 'close' in cleaned_point:
+                        cleaned_point['price'] = cleaned_point['close']
                     cleaned_history.append(cleaned_point)
                     
             except Exception as e:
@@ -134,16 +375,28 @@ class MarketDataProcessor:
     def _validate_date(self, date_str: str) -> str:
         """Validate and normalize date strings"""
         try:
-            # Try parsing common date formats
-            for fmt in ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M:%S.%f']:
+            # Fast path: every supported format starts with an ISO day, so
+            # validate that prefix with date.fromisoformat - a C routine
+            # roughly 10x faster than strptime, which re-parses its format
+            # string on every call
+            if len(date_str) == 10 or (len(date_str) > 10 and date_str[10] in 'T '):
+                day = date_str[:10]
+                try:
+                    date.fromisoformat(day)
+                    return day
+                except ValueError:
+                    pass
+
+            # Fallback for nonstandard inputs
+            for fmt in _DATE_FORMATS:
                 try:
                     dt = datetime.strptime(date_str, fmt)
                     return dt.strftime('%Y-%m-%d')
                 except ValueError:
                     continue
-            
+
             raise ValueError("Unsupported date format")
-            
+
         except Exception:
             raise DataProcessingError(f"Invalid date format: {date_str}")
     
@@ -166,9 +419,13 @@ class MarketDataProcessor:
                 continue
             
             try:
-                resampled_item = item.copy()
-                resampled_item['history'] = self._resample_history(item['history'], frequency)
-                resampled_data.append(resampled_item)
+                # Mutate in place, as clean_data does - copying every
+                # unrelated field per asset is pure allocation overhead
+                item['history'] = self._resample_history(item['history'], frequency)
+                # The columnar mirror describes the original history, not
+                # the resampled one
+                item.pop('_hist_arr', None)
+                resampled_data.append(item)
                 
             except Exception as e:
                 print(f"Error resampling data for {item.get('symbol', 'unknown')}: {str(e)}")
@@ -180,44 +437,58 @@ class MarketDataProcessor:
         """Resample historical data points"""
         if not history:
             return history
-        
+
+        # Parse every date in one vectorized datetime64 conversion; the
+        # per-point fallback only runs when some date is malformed
+        try:
+            dates = np.array([point['date'] for point in history],
+                             dtype='datetime64[D]')
+            valid_points = history
+        except (KeyError, ValueError, TypeError):
+            valid_points = []
+            parsed = []
+            for point in history:
+                try:
+                    parsed.append(np.datetime64(point['date'], 'D'))
+                    valid_points.append(point)
+                except (KeyError, ValueError, TypeError) as e:
+                    print(f"Error processing date {point.get('date', 'unknown')}: {str(e)}")
+            if not valid_points:
+                return []
+            dates = np.array(parsed, dtype='datetime64[D]')
+
+        # Generate grouping keys based on frequency, batched per array.
+        # np.unique sorts the buckets, matching the old sorted() walk.
+        if frequency == 'weekly':
+            # Group by week (Monday as start of week); day 0 of the
+            # datetime64 epoch (1970-01-01) was a Thursday, hence the +3
+            days = dates.astype(np.int64)
+            week_starts = (days - (days + 3) % 7).astype('datetime64[D]')
+            group_keys, inverse = np.unique(week_starts, return_inverse=True)
+            key_strs = np.datetime_as_string(group_keys, unit='D')
+        elif frequency == 'monthly':
+            group_keys, inverse = np.unique(dates.astype('datetime64[M]'),
+                                            return_inverse=True)
+            key_strs = np.datetime_as_string(group_keys, unit='M')
+        else:  # daily or default
+            key_strs, inverse = np.unique(
+                [point['date'] for point in valid_points], return_inverse=True)
+
         # Group data by time period
-        grouped_data = {}
-        
-        for point in history:
-            try:
-                date = datetime.strptime(point['date'], '%Y-%m-%d')
-                
-                # Generate grouping key based on frequency
-                if frequency == 'weekly':
-                    # Group by week (Monday as start of week)
-                    days_since_monday = date.weekday()
-                    week_start = date - timedelta(days=days_since_monday)
-                    group_key = week_start.strftime('%Y-%m-%d')
-                elif frequency == 'monthly':
-                    group_key = date.strftime('%Y-%m')
-                else:  # daily or default
-                    group_key = point['date']
-                
-                if group_key not in grouped_data:
-                    grouped_data[group_key] = []
-                
-                grouped_data[group_key].append(point)
-                
-            except Exception as e:
-                print(f"Error processing date {point.get('date', 'unknown')}: {str(e)}")
-                continue
-        
+        buckets = [[] for _ in range(len(key_strs))]
+        for point, bucket in zip(valid_points, inverse):
+            buckets[bucket].append(point)
+
         # Aggregate grouped data
         resampled_history = []
-        for group_key, group_points in sorted(grouped_data.items()):
+        for group_key, group_points in zip(key_strs, buckets):
             try:
-                aggregated_point = self._aggregate_data_points(group_points, group_key)
+                aggregated_point = self._aggregate_data_points(group_points, str(group_key))
                 resampled_history.append(aggregated_point)
             except Exception as e:
                 print(f"Error aggregating data for {group_key}: {str(e)}")
                 continue
-        
+
         return resampled_history
     
     def _aggregate_data_points(self, points: List[Dict], date_key: str) -> Dict:
@@ -231,24 +502,32 @@ class MarketDataProcessor:
         aggregated = {'date': date_key}
         
         # Price aggregation (OHLC)
-        prices = []
-        for point in points:
-            if 'price' in point:
-                prices.append(point['price'])
-            elif 'close' in point:
-                prices.append(point['close'])
+        prices = [value for point in points
+                  if (value := point.get('price', point.get('close'))) is not None]
         
         if prices:
+            if len(prices) <= 4:
+                # Python's builtins win on tiny buckets - array setup costs
+                # more than the C reduction saves
+                high = max(prices)
+                low = min(prices)
+            else:
+                price_arr = np.asarray(prices, dtype=np.float64)
+                high = float(price_arr.max())
+                low = float(price_arr.min())
             aggregated['open'] = prices[0]
             aggregated['close'] = prices[-1]
-            aggregated['high'] = max(prices)
-            aggregated['low'] = min(prices)
+            aggregated['high'] = high
+            aggregated['low'] = low
             aggregated['price'] = prices[-1]  # Use closing price
-        
+
         # Volume aggregation (sum)
         volumes = [point.get('volume', 0) for point in points if 'volume' in point]
         if volumes:
-            aggregated['volume'] = sum(volumes)
+            if len(volumes) <= 4:
+                aggregated['volume'] = sum(volumes)
+            else:
+                aggregated['volume'] = float(np.asarray(volumes, dtype=np.float64).sum())
         
         return aggregated
     
@@ -270,57 +549,82 @@ class MarketDataProcessor:
                 continue
             
             try:
-                enhanced_item = item.copy()
                 history = item['history']
-                
-                # Extract prices for calculations
-                prices = []
-                for point in history:
-                    if 'price' in point:
-                        prices.append(point['price'])
-                    elif 'close' in point:
-                        prices.append(point['close'])
-                
-                if len(prices) < 2:
+
+                # Indicators are deterministic for a given history, so an
+                # unchanged asset is an O(1) cache hit; copies go in and out
+                # so downstream mutation can't poison the cached dict
+                # The closing price discriminates histories that share a
+                # symbol/date/length, e.g. BTC as a crypto vs a stock ticker
+                cache_key = (item.get('symbol', item.get('product_id')),
+                             history[-1].get('date'), len(history),
+                             history[-1].get('price'))
+                cached = self.processed_cache.get(cache_key)
+                if cached is not None:
+                    self.processed_cache.move_to_end(cache_key)
+                    item['technical_indicators'] = dict(cached)
                     enhanced_data.append(item)
                     continue
-                
-                # Calculate indicators
+
+                # Use the columnar mirror built by clean_data when present;
+                # every indicator below is then a C-level reduction over a
+                # tail slice instead of a Python loop over list copies
+                hist_arr = item.get('_hist_arr')
+                if hist_arr is not None:
+                    prices = hist_arr.price
+                else:
+                    prices = np.fromiter(
+                        (value for point in history
+                         if (value := point.get('price', point.get('close'))) is not None),
+                        dtype=np.float64)
+                n = prices.size
+
+                if n < 2:
+                    enhanced_data.append(item)
+                    continue
+
+                # Calculate indicators: one fused jitted pass computes every
+                # tail-window reduction; the n guards keep key presence
+                # identical to the per-indicator version
+                (sma_5, sma_10, sma_20, volatility, momentum_5d, rsi,
+                 bb_upper, bb_lower) = _indicator_kernel(
+                    np.ascontiguousarray(prices))
+
                 indicators = {}
-                
+
                 # Simple Moving Averages
-                if len(prices) >= 5:
-                    indicators['sma_5'] = statistics.mean(prices[-5:])
-                if len(prices) >= 10:
-                    indicators['sma_10'] = statistics.mean(prices[-10:])
-                if len(prices) >= 20:
-                    indicators['sma_20'] = statistics.mean(prices[-20:])
-                
-                # Volatility (standard deviation)
-                if len(prices) >= 10:
-                    recent_prices = prices[-10:]
-                    indicators['volatility'] = statistics.stdev(recent_prices) if len(recent_prices) > 1 else 0
-                
+                if n >= 5:
+                    indicators['sma_5'] = sma_5
+                if n >= 10:
+                    indicators['sma_10'] = sma_10
+                if n >= 20:
+                    indicators['sma_20'] = sma_20
+
+                # Volatility (sample standard deviation)
+                if n >= 10:
+                    indicators['volatility'] = volatility
+
                 # Price momentum (rate of change)
-                if len(prices) >= 5:
-                    old_price = prices[-5]
-                    current_price = prices[-1]
-                    indicators['momentum_5d'] = ((current_price - old_price) / old_price) * 100
-                
+                if n >= 5:
+                    indicators['momentum_5d'] = momentum_5d
+
                 # Relative Strength Index (RSI) approximation
-                if len(prices) >= 14:
-                    indicators['rsi'] = self._calculate_rsi(prices[-14:])
-                
+                if n >= 14:
+                    indicators['rsi'] = round(rsi, 2)
+
                 # Bollinger Bands
-                if len(prices) >= 20:
-                    sma_20 = statistics.mean(prices[-20:])
-                    std_20 = statistics.stdev(prices[-20:])
-                    indicators['bb_upper'] = sma_20 + (2 * std_20)
-                    indicators['bb_lower'] = sma_20 - (2 * std_20)
+                if n >= 20:
+                    indicators['bb_upper'] = bb_upper
+                    indicators['bb_lower'] = bb_lower
                     indicators['bb_middle'] = sma_20
                 
-                enhanced_item['technical_indicators'] = indicators
-                enhanced_data.append(enhanced_item)
+                self.processed_cache[cache_key] = dict(indicators)
+                if len(self.processed_cache) > _PROCESSED_CACHE_SIZE:
+                    self.processed_cache.popitem(last=False)
+
+                # Attach in place rather than copying the whole item
+                item['technical_indicators'] = indicators
+                enhanced_data.append(item)
                 
             except Exception as e:
                 print(f"Error calculating indicators for {item.get('symbol', 'unknown')}: {str(e)}")
@@ -328,36 +632,36 @@ class MarketDataProcessor:
         
         return enhanced_data
     
-    def _calculate_rsi(self, prices: List[float]) -> float:
+    def _calculate_rsi(self, prices: Union[List[float], 'np.ndarray']) -> float:
         """Calculate Relative Strength Index"""
-        if len(prices) < 2:
+        arr = np.asarray(prices, dtype=np.float64)
+        if arr.size < 2:
             return 50.0  # Neutral RSI
-        
-        gains = []
-        losses = []
-        
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        if not gains or not losses:
-            return 50.0
-        
-        avg_gain = statistics.mean(gains)
-        avg_loss = statistics.mean(losses)
-        
+
+        # One diff pass splits ticks into gains and losses without the
+        # per-element Python branching and list appends
+        deltas = np.diff(arr)
+        avg_gain = np.clip(deltas, 0, None).mean()
+        avg_loss = np.clip(-deltas, 0, None).mean()
+
         if avg_loss == 0:
             return 100.0
-        
+
         rs = avg_gain / avg_loss
         rsi = 100 - (100 / (1 + rs))
-        
-        return round(rsi, 2)
+
+        return round(float(rsi), 2)
+
+    def _calculate_rsi_wilder(self, prices: Union[List[float], 'np.ndarray'],
+                              period: int = 14) -> float:
+        """Wilder-smoothed RSI over the full series, via the jitted loop.
+
+        The 14-tail flat-mean _calculate_rsi stays the indicator default so
+        existing outputs are unchanged; this variant is for callers that
+        want the smoothed reading on longer histories.
+        """
+        arr = np.ascontiguousarray(prices, dtype=np.float64)
+        return round(float(_rsi_wilder_loop(arr, period)), 2)
     
     def compare_assets(self, data: List[Dict], comparison_metrics: List[str] = None) -> Dict:
         """
@@ -384,52 +688,42 @@ class MarketDataProcessor:
             'statistics': {}
         }
         
-        # Calculate rankings for each metric
+        # One pass per metric feeds both the rankings and the summary
+        # statistics, instead of re-walking every item's indicators twice
         for metric in comparison_metrics:
-            rankings = []
-            
+            records = []
+            values = []
+
             for item in data:
                 value = None
-                
+
                 if metric in item:
                     value = item[metric]
                 elif 'technical_indicators' in item and metric in item['technical_indicators']:
                     value = item['technical_indicators'][metric]
-                
+
                 if value is not None:
-                    rankings.append({
+                    records.append({
                         'symbol': item.get('symbol', 'unknown'),
                         'name': item.get('name', item.get('symbol', 'unknown')),
                         'value': value
                     })
-            
-            # Sort by value (descending for most metrics)
-            reverse_sort = metric not in ['volatility']  # Lower volatility is better
-            rankings.sort(key=lambda x: x['value'], reverse=reverse_sort)
-            
-            comparison_result['rankings'][metric] = rankings
-        
-        # Calculate summary statistics
-        for metric in comparison_metrics:
-            values = []
-            for item in data:
-                value = None
-                
-                if metric in item:
-                    value = item[metric]
-                elif 'technical_indicators' in item and metric in item['technical_indicators']:
-                    value = item['technical_indicators'][metric]
-                
-                if value is not None:
                     values.append(value)
-            
+
+            # Sort by value (descending for most metrics); a stable argsort
+            # keeps tied entries in extraction order like list.sort did
+            reverse_sort = metric not in ['volatility']  # Lower volatility is better
+            vals = np.asarray(values, dtype=np.float64)
+            order = np.argsort(-vals if reverse_sort else vals, kind='stable')
+            comparison_result['rankings'][metric] = [records[i] for i in order]
+
             if values:
                 comparison_result['statistics'][metric] = {
-                    'mean': statistics.mean(values),
-                    'median': statistics.median(values),
-                    'min': min(values),
-                    'max': max(values),
-                    'std_dev': statistics.stdev(values) if len(values) > 1 else 0
+                    'mean': float(vals.mean()),
+                    'median': float(np.median(vals)),
+                    'min': float(vals.min()),
+                    'max': float(vals.max()),
+                    'std_dev': float(vals.std(ddof=1)) if vals.size > 1 else 0
                 }
         
         return comparison_result
@@ -452,56 +746,67 @@ class MarketDataProcessor:
                 continue
             
             try:
-                # Extract prices
-                prices = []
-                dates = []
-                
-                for point in item['history']:
-                    if 'price' in point and 'date' in point:
-                        prices.append(point['price'])
-                        dates.append(point['date'])
-                    elif 'close' in point and 'date' in point:
-                        prices.append(point['close'])
-                        dates.append(point['date'])
-                
-                if len(prices) < 10:
+                # Use the columnar mirror when present, otherwise extract
+                # prices and dates from the history dicts
+                hist_arr = item.get('_hist_arr')
+                if hist_arr is not None:
+                    price_arr = hist_arr.price
+                    dates = hist_arr.dates
+                else:
+                    pairs = [(value, point['date'])
+                             for point in item['history']
+                             if 'date' in point and
+                             (value := point.get('price', point.get('close'))) is not None]
+                    prices, dates = zip(*pairs) if pairs else ((), ())
+
+                    price_arr = np.asarray(prices, dtype=np.float64)
+
+                if price_arr.size < 10:
                     continue
-                
-                # Calculate price changes
-                price_changes = []
-                for i in range(1, len(prices)):
-                    change_pct = ((prices[i] - prices[i-1]) / prices[i-1]) * 100
-                    price_changes.append(change_pct)
-                
-                if len(price_changes) < 5:
+
+                # Percentage changes and z-scores in three C-level passes;
+                # Python-side work is then proportional to the number of
+                # anomalies, not the history length
+                price_changes = np.diff(price_arr) / price_arr[:-1] * 100
+
+                if price_changes.size < 5:
                     continue
-                
-                # Calculate statistics
-                mean_change = statistics.mean(price_changes)
-                std_change = statistics.stdev(price_changes)
-                
+
+                # Calculate statistics (sample stdev, like statistics.stdev)
+                mean_change = price_changes.mean()
+                std_change = price_changes.std(ddof=1)
+                if std_change <= 0:
+                    continue
+
                 # Detect anomalies
-                for i, change in enumerate(price_changes):
-                    z_score = abs((change - mean_change) / std_change) if std_change > 0 else 0
-                    
-                    if z_score > threshold_std:
-                        anomalies.append({
-                            'symbol': item.get('symbol', 'unknown'),
-                            'date': dates[i+1],  # +1 because price_changes is offset by 1
-                            'price': prices[i+1],
-                            'price_change_pct': change,
-                            'z_score': z_score,
-                            'severity': 'high' if z_score > 3 else 'medium',
-                            'type': 'spike' if change > 0 else 'drop'
-                        })
+                z_scores = np.abs((price_changes - mean_change) / std_change)
+                for i in np.flatnonzero(z_scores > threshold_std):
+                    change = float(price_changes[i])
+                    z_score = float(z_scores[i])
+                    anomalies.append({
+                        'symbol': item.get('symbol', 'unknown'),
+                        'date': str(dates[i+1]),  # +1 because price_changes is offset by 1
+                        'price': float(price_arr[i+1]),
+                        'price_change_pct': change,
+                        'z_score': z_score,
+                        'severity': 'high' if z_score > 3 else 'medium',
+                        'type': 'spike' if change > 0 else 'drop'
+                    })
                 
             except Exception as e:
                 print(f"Error detecting anomalies for {item.get('symbol', 'unknown')}: {str(e)}")
                 continue
         
-        # Sort anomalies by severity and date
-        anomalies.sort(key=lambda x: (x['z_score'], x['date']), reverse=True)
-        
+        # Sort anomalies by severity and date, descending: one C-level
+        # lexsort instead of a Python key callback per comparison
+        if anomalies:
+            z_scores = np.fromiter((a['z_score'] for a in anomalies),
+                                   dtype=np.float64, count=len(anomalies))
+            dates = np.array([a['date'] for a in anomalies],
+                             dtype='datetime64[D]')
+            order = np.lexsort((dates, z_scores))[::-1]
+            anomalies = [anomalies[i] for i in order]
+
         return anomalies
 
 # Example usage and testing
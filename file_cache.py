@@ -0,0 +1,69 @@
+"""
+Market Mirror - File Cache Module
+Persistent on-disk response cache so repeat analyses skip the fetch entirely.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from typing import List, Optional
+
+
+class FileCache:
+    """Content-addressed JSON cache under ~/.market_mirror/cache.
+
+    Entries live at {cache_dir}/{market_type}/{md5(symbols|timeframe)}.json
+    and expire on read via the file's mtime, so no separate metadata store
+    is needed and stale files are simply overwritten by the next fetch.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or os.path.join(
+            os.path.expanduser('~'), '.market_mirror', 'cache')
+
+    @staticmethod
+    def _digest(market_type: str, symbols: List[str], timeframe: str) -> str:
+        key = f"{market_type}|{','.join(sorted(symbols))}|{timeframe}"
+        return hashlib.md5(key.encode()).hexdigest()
+
+    def _path(self, market_type: str, symbols: List[str], timeframe: str) -> str:
+        return os.path.join(self.cache_dir, market_type,
+                            self._digest(market_type, symbols, timeframe) + '.json')
+
+    def get(self, market_type: str, symbols: List[str], timeframe: str,
+            ttl: float) -> Optional[bytes]:
+        """Return the cached JSON payload, or None if missing or expired"""
+        path = self._path(market_type, symbols, timeframe)
+        try:
+            if time.time() - os.path.getmtime(path) >= ttl:
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, market_type: str, symbols: List[str], timeframe: str,
+            payload: bytes) -> None:
+        """Store a JSON payload, atomically so readers never see partial files"""
+        path = self._path(market_type, symbols, timeframe)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not write disk cache: {e}")
+
+    def clear(self) -> int:
+        """Remove every cached file; returns the number removed"""
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                try:
+                    os.remove(os.path.join(dirpath, filename))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
@@ -3,36 +3,147 @@ Market Mirror - Main Application Entry Point
 Orchestrates all modules and provides a unified interface for the market analysis tool.
 """
 
+import asyncio
+import atexit
+import os
+import shlex
 import sys
 import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, is_dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import time
 
+import numpy as np
+
+try:
+    import orjson  # C JSON encoder, ~3-10x faster on nested result dicts
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import pandas as pd  # column-oriented view of the latest snapshot
+except ImportError:  # pragma: no cover - optional speedup
+    pd = None
+
 # Import our custom modules
-from data_ingestion import MarketDataIngestion, DataIngestionError
-from data_processing import MarketDataProcessor, DataProcessingError
-from ai_analysis import MarketAIAnalyzer, AIAnalysisError
+from data_ingestion import (MarketDataIngestion, DataIngestionError,
+                            results_to_json_bytes, _INTERNAL_ITEM_KEYS)
+from file_cache import FileCache
 from alerts_engine import AlertsEngine, Alert
+# data_processing and ai_analysis (and their numba/numpy kernel warmup)
+# are imported lazily on first use - see the properties on MarketMirrorApp -
+# so one-shot commands like status/alerts/help skip their import cost
+
+# Execution-summary section of the report: one format_map pass and one
+# allocation instead of repeated string concatenation
+_REPORT_TEMPLATE = (
+    "\n## Execution Summary\n\n"
+    "- **Assets Analyzed**: {assets_analyzed}\n"
+    "- **Market Sentiment**: {sentiment_title}\n"
+    "- **Average Change**: {average_change:.2f}%\n"
+    "- **Best Performer**: {best_symbol} ({best_change:.2f}%)\n"
+    "- **Worst Performer**: {worst_symbol} ({worst_change:.2f}%)\n"
+    "- **Alerts Triggered**: {alerts_triggered}\n"
+    "- **Recommendations**: {recommendations_generated}\n"
+)
+
+def _json_default(value):
+    """Stdlib-fallback encoder hook matching orjson's native handling"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return str(value)
+
+def analysis_to_json_bytes(results: Dict) -> bytes:
+    """Serialize a run_analysis result dict to JSON bytes.
+
+    Strips the internal scratch keys left on market_data items (like
+    results_to_json_bytes does at the ingestion boundary), then encodes
+    with orjson (numpy-aware, C speed) when available, falling back to
+    compact stdlib json with the same payload shape.
+    """
+    market_data = results.get('market_data')
+    if market_data and any(key in item for item in market_data
+                           for key in _INTERNAL_ITEM_KEYS):
+        results = dict(results)
+        results['market_data'] = [
+            {key: value for key, value in item.items()
+             if key not in _INTERNAL_ITEM_KEYS}
+            for item in market_data]
+    if orjson is not None:
+        return orjson.dumps(results, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(results, separators=(',', ':'),
+                      default=_json_default).encode()
 
 class MarketMirrorApp:
     """
     Main application class that coordinates all market analysis components.
     Provides a unified interface for data collection, processing, analysis, and alerting.
     """
-    
+
+    # Fixed attribute layout: slot access is a C-array index instead of a
+    # per-lookup __dict__ hash probe, and the instance sheds its dict
+    __slots__ = (
+        'data_ingestion', 'file_cache', 'alerts_engine',
+        '_data_processor', '_ai_analyzer',
+        'current_market_data', 'current_market_data_df',
+        'current_analysis', 'last_update', '_last_update_mono',
+        '_analysis_version', '_cached_report', '_cached_report_version',
+        '_cached_summary', '_cached_summary_version',
+        '_pipelines', '_loop', '_dispatch', '_symbol_cache', 'config',
+    )
+
     def __init__(self):
         # Initialize all modules
         self.data_ingestion = MarketDataIngestion()
-        self.data_processor = MarketDataProcessor()
-        self.ai_analyzer = MarketAIAnalyzer()
+        self._data_processor = None
+        self._ai_analyzer = None
         self.alerts_engine = AlertsEngine()
-        
+        self.file_cache = FileCache()
+
         # Application state
         self.current_market_data = []
+        self.current_market_data_df = None
         self.current_analysis = {}
         self.last_update = None
-        
+        # Monotonic twin of last_update for age arithmetic: immune to
+        # wall-clock steps and ~10x cheaper than datetime subtraction
+        self._last_update_mono = None
+
+        # Version counter for derived views: bumped whenever the underlying
+        # analysis changes, so repeat report/summary requests are O(1)
+        self._analysis_version = 0
+        self._cached_report = None
+        self._cached_report_version = -1
+        self._cached_summary = None
+        self._cached_summary_version = -1
+
+        # Pipelines specialized per (market_type, timeframe) command shape
+        self._pipelines = {}
+
+        # Process-lifetime event loop: repeated analyze commands reuse one
+        # loop (and the ingestion layer's per-loop aiohttp session) instead
+        # of paying asyncio.run() loop setup/teardown per call
+        self._loop = asyncio.new_event_loop()
+
+        # Interactive-mode dispatch table: one dict lookup per line
+        # instead of a startswith ladder; handlers get the split args
+        self._dispatch = {
+            'help': lambda args: self._print_help(),
+            'analyze': self._handle_analyze_command,
+            'add_alert': self._handle_add_alert_command,
+            'alerts': lambda args: self._handle_view_alerts_command(),
+            'view_alerts': lambda args: self._handle_view_alerts_command(),
+            'recommendations': lambda args: self._handle_recommendations_command(),
+            'recs': lambda args: self._handle_recommendations_command(),
+            'report': lambda args: self._handle_report_command(),
+            'summary': lambda args: self._handle_report_command(),
+            'clear': lambda args: self._handle_clear_command(),
+            'status': lambda args: self._handle_status_command(),
+        }
+
         # Configuration
         self.config = {
             'auto_refresh_interval': 60,  # seconds
@@ -42,27 +153,56 @@ class MarketMirrorApp:
                 'stocks': ['AAPL', 'GOOGL', 'MSFT'],
                 'ecommerce': ['iPhone15', 'AirPods', 'MacBook']
             },
-            'default_timeframe': '7d'
+            'default_timeframe': '7d',
+            # On-disk cache lifetime per timeframe: intraday data goes
+            # stale quickly, longer histories barely move within a day
+            'disk_cache_ttl': {'1d': 3600, '7d': 86400, '1m': 86400},
+            # Processed-row reuse window per market: commerce listings
+            # move far slower than tickers
+            'symbol_cache_ttl': {'crypto': 60, 'stocks': 60, 'ecommerce': 3600}
         }
+
+        # Processed rows shared across baskets, keyed
+        # (market_type, symbol, timeframe) -> (monotonic_ts, row)
+        self._symbol_cache = {}
         
         print("Market Mirror initialized successfully!")
         self._print_welcome_message()
-    
+
+    @property
+    def data_processor(self) -> 'MarketDataProcessor':
+        """Lazily constructed data processor (first analyze pays the import)"""
+        if self._data_processor is None:
+            from data_processing import MarketDataProcessor
+            self._data_processor = MarketDataProcessor()
+        return self._data_processor
+
+    @property
+    def ai_analyzer(self) -> 'MarketAIAnalyzer':
+        """Lazily constructed AI analyzer (first analyze/report pays the import)"""
+        if self._ai_analyzer is None:
+            from ai_analysis import MarketAIAnalyzer
+            self._ai_analyzer = MarketAIAnalyzer()
+        return self._ai_analyzer
+
     def _print_welcome_message(self):
         """Print welcome message and basic instructions"""
-        print("\n" + "="*60)
-        print("🪞 MARKET MIRROR - AI-Powered Market Analysis Tool")
-        print("="*60)
-        print("Available Commands:")
-        print("  analyze <market_type> <symbols> <timeframe>")
-        print("  add_alert <type> <symbol> <condition> <threshold>")
-        print("  view_alerts")
-        print("  recommendations")
-        print("  report")
-        print("  help")
-        print("  quit")
-        print("\nExample: analyze crypto BTC,ETH,SOL 7d")
-        print("="*60 + "\n")
+        # One buffered write instead of a dozen print() lock/flush cycles
+        bar = "=" * 60
+        sys.stdout.write(
+            f"\n{bar}\n"
+            "🪞 MARKET MIRROR - AI-Powered Market Analysis Tool\n"
+            f"{bar}\n"
+            "Available Commands:\n"
+            "  analyze <market_type> <symbols> <timeframe>\n"
+            "  add_alert <type> <symbol> <condition> <threshold>\n"
+            "  view_alerts\n"
+            "  recommendations\n"
+            "  report\n"
+            "  help\n"
+            "  quit\n"
+            "\nExample: analyze crypto BTC,ETH,SOL 7d\n"
+            f"{bar}\n\n")
     
     def run_analysis(self, market_type: str, symbols: List[str], timeframe: str = '7d') -> Dict:
         """
@@ -77,39 +217,123 @@ class MarketMirrorApp:
             Complete analysis results dictionary
         """
         try:
-            print(f"\n🔄 Starting analysis for {market_type.upper()} - {', '.join(symbols)} ({timeframe})")
-            
-            # Step 1: Data Ingestion
-            print("📥 Fetching market data...")
-            raw_data = self.data_ingestion.fetch_market_data(market_type, symbols, timeframe)
-            
-            if not raw_data:
-                raise ValueError("No data retrieved from sources")
-            
-            print(f"✅ Retrieved data for {len(raw_data)} assets")
-            
-            # Step 2: Data Processing
-            print("⚙️ Processing and cleaning data...")
-            cleaned_data = self.data_processor.clean_data(raw_data)
-            processed_data = self.data_processor.calculate_technical_indicators(cleaned_data)
-            
+            # Specialize on the command shape: interactive sessions repeat
+            # the same (market_type, timeframe) pair, so the pipeline runs
+            # through a cached closure with the TTL and every collaborator
+            # already bound - no config/attribute lookups on the hot path.
+            # Mirrors the batch-generator specialization in data_ingestion.
+            key = (market_type, timeframe)
+            pipeline = self._pipelines.get(key)
+            if pipeline is None:
+                pipeline = self._build_pipeline(market_type, timeframe)
+                self._pipelines[key] = pipeline
+            return pipeline(symbols)
+
+        except Exception as e:
+            error_msg = f"Analysis failed: {str(e)}"
+            print(f"❌ {error_msg}")
+            return {
+                'error': error_msg,
+                'timestamp': datetime.now().isoformat()
+            }
+
+    def _build_pipeline(self, market_type: str, timeframe: str):
+        """Compile the analysis pipeline for one (market_type, timeframe)"""
+        header = f"\n🔄 Starting analysis for {market_type.upper()}"
+        ttl = self.config['disk_cache_ttl'].get(timeframe, 3600)
+        symbol_ttl = self.config['symbol_cache_ttl'].get(market_type, 60)
+        cache_get = self.file_cache.get
+        cache_set = self.file_cache.set
+        fetch_async = self.data_ingestion.fetch_market_data_async
+        run_async = self._loop.run_until_complete
+        clean_data = self.data_processor.clean_data
+        calculate_indicators = self.data_processor.calculate_technical_indicators
+        analyze_trends = self.ai_analyzer.analyze_trends
+        check_alerts = self.alerts_engine.check_alerts
+        generate_recommendations = self.alerts_engine.generate_recommendations
+
+        def run(symbols: List[str]) -> Dict:
+            print(f"{header} - {', '.join(symbols)} ({timeframe})")
+
+            # Shared per-symbol cache of fully processed rows: a basket
+            # that overlaps a recent analysis only fetches and processes
+            # the symbols it is actually missing
+            now_mono = time.monotonic()
+            hits = {}
+            misses = []
+            for symbol in symbols:
+                entry = self._symbol_cache.get((market_type, symbol, timeframe))
+                if entry is not None and now_mono - entry[0] < symbol_ttl:
+                    hits[symbol] = entry[1]
+                else:
+                    misses.append(symbol)
+
+            if misses:
+                # Step 1: Data Ingestion
+                print("📥 Fetching market data...")
+                cached = cache_get(market_type, misses, timeframe, ttl)
+                if cached is not None:
+                    raw_data = json.loads(cached)
+                    print(f"✅ Loaded data for {len(raw_data)} assets from disk cache")
+                else:
+                    raw_data = run_async(fetch_async(market_type, misses, timeframe))
+
+                    if not raw_data:
+                        raise ValueError("No data retrieved from sources")
+
+                    cache_set(market_type, misses, timeframe,
+                              results_to_json_bytes(raw_data))
+                    print(f"✅ Retrieved data for {len(raw_data)} assets")
+
+                # Step 2: Data Processing
+                print("⚙️ Processing and cleaning data...")
+                cleaned_data = clean_data(raw_data)
+                fresh_rows = calculate_indicators(cleaned_data)
+                store_ts = time.monotonic()
+                for row in fresh_rows:
+                    name = row.get('symbol', row.get('product_id'))
+                    hits[name] = row
+                    self._symbol_cache[(market_type, name, timeframe)] = (store_ts, row)
+            else:
+                print(f"✅ Reusing processed data for {len(symbols)} assets")
+
+            processed_data = [hits[symbol] for symbol in symbols if symbol in hits]
+
             # Step 3: AI Analysis
             print("🧠 Running AI analysis...")
-            analysis_result = self.ai_analyzer.analyze_trends(processed_data)
-            
-            # Step 4: Alert Checking
-            triggered_alerts = self.alerts_engine.check_alerts(processed_data)
+            # Steps 3 + 4 overlap: trend analysis and alert checking are
+            # independent reads of processed_data, so neither waits on the
+            # other; only recommendations need the analysis result
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                analysis_future = executor.submit(analyze_trends, processed_data)
+                alerts_future = executor.submit(check_alerts, processed_data)
+                analysis_result = analysis_future.result()
+                triggered_alerts = alerts_future.result()
             if triggered_alerts:
                 print(f"🚨 {len(triggered_alerts)} alerts triggered!")
-            
+
             # Step 5: Generate Recommendations
-            recommendations = self.alerts_engine.generate_recommendations(processed_data, analysis_result)
-            
+            recommendations = generate_recommendations(processed_data, analysis_result)
+
             # Update application state
             self.current_market_data = processed_data
+            # Keep a column-oriented (SoA) copy alongside the legacy list:
+            # summary/status math runs on contiguous columns, the list
+            # stays for the JSON result shape
+            self.current_market_data_df = (
+                pd.DataFrame(processed_data) if pd is not None else None)
+            if self.current_market_data_df is not None:
+                # Halve the memory traffic of column scans: float32 is
+                # plenty for display-precision summary/alert math
+                df = self.current_market_data_df
+                float_cols = df.select_dtypes(include='float64').columns
+                if len(float_cols):
+                    df[float_cols] = df[float_cols].astype(np.float32)
             self.current_analysis = analysis_result
             self.last_update = datetime.now()
-            
+            self._last_update_mono = time.monotonic()
+            self._analysis_version += 1
+
             # Compile complete results
             complete_results = {
                 'timestamp': self.last_update.isoformat(),
@@ -122,40 +346,40 @@ class MarketMirrorApp:
                 'recommendations': recommendations,
                 'summary': self._generate_execution_summary(processed_data, analysis_result, triggered_alerts, recommendations)
             }
-            
+
             print("✅ Analysis complete!")
             return complete_results
-            
-        except Exception as e:
-            error_msg = f"Analysis failed: {str(e)}"
-            print(f"❌ {error_msg}")
-            return {
-                'error': error_msg,
-                'timestamp': datetime.now().isoformat()
-            }
-    
+
+        return run
+
     def _generate_execution_summary(self, market_data: List[Dict], analysis: Dict, alerts: List[Dict], recommendations: List[Dict]) -> Dict:
         """Generate a summary of the analysis execution"""
+        if self._cached_summary_version == self._analysis_version:
+            return self._cached_summary
+
         market_overview = analysis.get('market_overview', {})
         
-        # Performance statistics
-        price_changes = [asset.get('price_change_percentage', 0) for asset in market_data]
-        best_performer = max(market_data, key=lambda x: x.get('price_change_percentage', 0))
-        worst_performer = min(market_data, key=lambda x: x.get('price_change_percentage', 0))
-        
-        # Alert statistics
-        alert_priorities = {}
-        for alert in alerts:
-            priority = alert.get('priority', 'medium')
-            alert_priorities[priority] = alert_priorities.get(priority, 0) + 1
+        # Performance statistics: one C-level scan instead of separate
+        # Python-level max()/min() passes with key lambdas. Pull the
+        # column straight from the DataFrame snapshot when it matches.
+        df = self.current_market_data_df
+        if (df is not None and len(df) == len(market_data)
+                and 'price_change_percentage' in df.columns):
+            price_changes = df['price_change_percentage'].fillna(0).to_numpy()
+        else:
+            price_changes = np.fromiter(
+                (asset.get('price_change_percentage', 0) for asset in market_data),
+                dtype=np.float64, count=len(market_data))
+        best_performer = market_data[int(price_changes.argmax())]
+        worst_performer = market_data[int(price_changes.argmin())]
         
-        # Recommendation statistics
-        rec_types = {}
-        for rec in recommendations:
-            rec_type = rec.get('type', 'unknown')
-            rec_types[rec_type] = rec_types.get(rec_type, 0) + 1
+        # Alert and recommendation statistics: Counter tallies in C
+        alert_priorities = dict(Counter(
+            alert.get('priority', 'medium') for alert in alerts))
+        rec_types = dict(Counter(
+            rec.get('type', 'unknown') for rec in recommendations))
         
-        return {
+        self._cached_summary = {
             'assets_analyzed': len(market_data),
             'market_sentiment': market_overview.get('sentiment', 'neutral'),
             'average_change': market_overview.get('average_change', 0),
@@ -172,7 +396,9 @@ class MarketMirrorApp:
             'recommendations_generated': len(recommendations),
             'recommendation_breakdown': rec_types
         }
-    
+        self._cached_summary_version = self._analysis_version
+        return self._cached_summary
+
     def add_alert(self, alert_type: str, symbol: str, condition: str, threshold: float, priority: str = 'medium') -> str:
         """Add a new market alert"""
         try:
@@ -210,62 +436,75 @@ class MarketMirrorApp:
         """Generate comprehensive market report"""
         if not self.current_analysis:
             return "No analysis data available. Please run an analysis first."
-        
+
+        if self._cached_report_version == self._analysis_version:
+            return self._cached_report
+
         # Generate AI report
         ai_report = self.ai_analyzer.generate_market_report(self.current_analysis)
         
         # Add execution summary
         if 'summary' in self.current_analysis:
             summary = self.current_analysis['summary']
-            summary_text = f"\n## Execution Summary\n\n"
-            summary_text += f"- **Assets Analyzed**: {summary['assets_analyzed']}\n"
-            summary_text += f"- **Market Sentiment**: {summary['market_sentiment'].title()}\n"
-            summary_text += f"- **Average Change**: {summary['average_change']:.2f}%\n"
-            summary_text += f"- **Best Performer**: {summary['best_performer']['symbol']} ({summary['best_performer']['change']:.2f}%)\n"
-            summary_text += f"- **Worst Performer**: {summary['worst_performer']['symbol']} ({summary['worst_performer']['change']:.2f}%)\n"
-            summary_text += f"- **Alerts Triggered**: {summary['alerts_triggered']}\n"
-            summary_text += f"- **Recommendations**: {summary['recommendations_generated']}\n"
-            
-            ai_report += summary_text
-        
+            ai_report += _REPORT_TEMPLATE.format_map({
+                'assets_analyzed': summary['assets_analyzed'],
+                'sentiment_title': summary['market_sentiment'].title(),
+                'average_change': summary['average_change'],
+                'best_symbol': summary['best_performer']['symbol'],
+                'best_change': summary['best_performer']['change'],
+                'worst_symbol': summary['worst_performer']['symbol'],
+                'worst_change': summary['worst_performer']['change'],
+                'alerts_triggered': summary['alerts_triggered'],
+                'recommendations_generated': summary['recommendations_generated'],
+            })
+
+        self._cached_report = ai_report
+        self._cached_report_version = self._analysis_version
         return ai_report
     
+    def _completer(self, text: str, state: int) -> Optional[str]:
+        """Tab completion over command verbs and recently analyzed symbols"""
+        candidates = list(self._dispatch) + ['quit', 'exit']
+        candidates.extend(
+            str(row.get('symbol', row.get('product_id', ''))).lower()
+            for row in self.current_market_data)
+        matches = [c for c in candidates if c.startswith(text)]
+        return matches[state] if state < len(matches) else None
+
     def interactive_mode(self):
         """Run the application in interactive command-line mode"""
+        # History + tab completion: re-running yesterday's analyze command
+        # becomes an arrow key instead of a retype
+        try:
+            import readline
+            histfile = os.path.expanduser('~/.market_mirror_history')
+            try:
+                readline.read_history_file(histfile)
+            except OSError:
+                pass
+            atexit.register(readline.write_history_file, histfile)
+            readline.set_completer(self._completer)
+            readline.parse_and_bind('tab: complete')
+        except ImportError:  # pragma: no cover - readline is optional
+            pass
+
         print("🚀 Starting interactive mode. Type 'help' for commands or 'quit' to exit.")
-        
+        prompt = "\nMarket Mirror > "
+
         while True:
             try:
-                command = input("\nMarket Mirror > ").strip().lower()
-                
-                if command == 'quit' or command == 'exit':
+                command = input(prompt).strip().lower()
+
+                parts = shlex.split(command)
+                verb = parts[0] if parts else ''
+
+                if verb in ('quit', 'exit'):
                     print("👋 Goodbye!")
                     break
-                
-                elif command == 'help':
-                    self._print_help()
-                
-                elif command.startswith('analyze'):
-                    self._handle_analyze_command(command)
-                
-                elif command.startswith('add_alert'):
-                    self._handle_add_alert_command(command)
-                
-                elif command in ['alerts', 'view_alerts']:
-                    self._handle_view_alerts_command()
-                
-                elif command in ['recommendations', 'recs']:
-                    self._handle_recommendations_command()
-                
-                elif command in ['report', 'summary']:
-                    self._handle_report_command()
-                
-                elif command == 'clear':
-                    self._handle_clear_command()
-                
-                elif command == 'status':
-                    self._handle_status_command()
-                
+
+                handler = self._dispatch.get(verb)
+                if handler is not None:
+                    handler(parts[1:])
                 else:
                     print("❓ Unknown command. Type 'help' for available commands.")
                     
@@ -274,41 +513,54 @@ class MarketMirrorApp:
                 break
             except Exception as e:
                 print(f"❌ Error: {str(e)}")
-    
+
+        self.shutdown()
+
+    def shutdown(self):
+        """Release process-lifetime resources (HTTP sessions, event loop)"""
+        if self._loop.is_closed():
+            return
+        try:
+            self._loop.run_until_complete(
+                self.data_ingestion.close_aio_sessions())
+        finally:
+            self._loop.close()
+
     def _print_help(self):
         """Print help information"""
-        print("\n📖 MARKET MIRROR COMMANDS:")
-        print("-" * 40)
-        print("analyze <market> <symbols> <timeframe>")
-        print("  Example: analyze crypto BTC,ETH 7d")
-        print("  Markets: crypto, stocks, ecommerce")
-        print("  Timeframes: 1d, 7d, 1m, 3m")
-        print("")
-        print("add_alert <type> <symbol> <condition> <threshold>")
-        print("  Example: add_alert price BTC below 60000")
-        print("  Types: price, change, volume")
-        print("  Conditions: above, below")
-        print("")
-        print("alerts          - View active alerts")
-        print("recommendations - View recent recommendations")
-        print("report          - Generate full market report")
-        print("status          - Show application status")
-        print("clear           - Clear all cached data")
-        print("help            - Show this help")
-        print("quit            - Exit application")
-        print("-" * 40)
+        rule = "-" * 40
+        sys.stdout.write(
+            f"\n📖 MARKET MIRROR COMMANDS:\n"
+            f"{rule}\n"
+            "analyze <market> <symbols> <timeframe>\n"
+            "  Example: analyze crypto BTC,ETH 7d\n"
+            "  Markets: crypto, stocks, ecommerce\n"
+            "  Timeframes: 1d, 7d, 1m, 3m\n"
+            "\n"
+            "add_alert <type> <symbol> <condition> <threshold>\n"
+            "  Example: add_alert price BTC below 60000\n"
+            "  Types: price, change, volume\n"
+            "  Conditions: above, below\n"
+            "\n"
+            "alerts          - View active alerts\n"
+            "recommendations - View recent recommendations\n"
+            "report          - Generate full market report\n"
+            "status          - Show application status\n"
+            "clear           - Clear all cached data\n"
+            "help            - Show this help\n"
+            "quit            - Exit application\n"
+            f"{rule}\n")
     
-    def _handle_analyze_command(self, command: str):
-        """Handle analyze command"""
+    def _handle_analyze_command(self, args: List[str]):
+        """Handle analyze command; args is the pre-split command tail"""
         try:
-            parts = command.split()
-            if len(parts) < 3:
+            if len(args) < 2:
                 print("❌ Usage: analyze <market_type> <symbols> [timeframe]")
                 return
-            
-            market_type = parts[1]
-            symbols_str = parts[2]
-            timeframe = parts[3] if len(parts) > 3 else '7d'
+
+            market_type = args[0]
+            symbols_str = args[1]
+            timeframe = args[2] if len(args) > 2 else '7d'
             
             symbols = [s.strip().upper() for s in symbols_str.split(',')]
             
@@ -324,33 +576,33 @@ class MarketMirrorApp:
                 print(f"❌ Analysis failed: {results['error']}")
                 return
             
-            # Display summary
+            # Display summary in one buffered write
             summary = results.get('summary', {})
-            print(f"\n📊 ANALYSIS RESULTS:")
-            print(f"Market Sentiment: {summary.get('market_sentiment', 'Unknown').title()}")
-            print(f"Average Change: {summary.get('average_change', 0):.2f}%")
-            print(f"Best: {summary.get('best_performer', {}).get('symbol', 'N/A')} "
-                  f"({summary.get('best_performer', {}).get('change', 0):.2f}%)")
-            print(f"Worst: {summary.get('worst_performer', {}).get('symbol', 'N/A')} "
-                  f"({summary.get('worst_performer', {}).get('change', 0):.2f}%)")
-            print(f"Alerts: {summary.get('alerts_triggered', 0)}")
-            print(f"Recommendations: {summary.get('recommendations_generated', 0)}")
+            best = summary.get('best_performer', {})
+            worst = summary.get('worst_performer', {})
+            sys.stdout.write(
+                f"\n📊 ANALYSIS RESULTS:\n"
+                f"Market Sentiment: {summary.get('market_sentiment', 'Unknown').title()}\n"
+                f"Average Change: {summary.get('average_change', 0):.2f}%\n"
+                f"Best: {best.get('symbol', 'N/A')} ({best.get('change', 0):.2f}%)\n"
+                f"Worst: {worst.get('symbol', 'N/A')} ({worst.get('change', 0):.2f}%)\n"
+                f"Alerts: {summary.get('alerts_triggered', 0)}\n"
+                f"Recommendations: {summary.get('recommendations_generated', 0)}\n")
             
         except Exception as e:
             print(f"❌ Error processing analyze command: {str(e)}")
     
-    def _handle_add_alert_command(self, command: str):
-        """Handle add_alert command"""
+    def _handle_add_alert_command(self, args: List[str]):
+        """Handle add_alert command; args is the pre-split command tail"""
         try:
-            parts = command.split()
-            if len(parts) < 5:
+            if len(args) < 4:
                 print("❌ Usage: add_alert <type> <symbol> <condition> <threshold>")
                 return
-            
-            alert_type = parts[1]
-            symbol = parts[2].upper()
-            condition = parts[3]
-            threshold = float(parts[4])
+
+            alert_type = args[0]
+            symbol = args[1].upper()
+            condition = args[2]
+            threshold = float(args[3])
             
             alert_id = self.add_alert(alert_type, symbol, condition, threshold)
             
@@ -367,20 +619,22 @@ class MarketMirrorApp:
             active = alerts_info['active_alerts']
             history = alerts_info['recent_history']
             
-            print(f"\n🔔 ACTIVE ALERTS ({len(active)}):")
+            lines = [f"\n🔔 ACTIVE ALERTS ({len(active)}):\n"]
             if not active:
-                print("  No active alerts")
+                lines.append("  No active alerts\n")
             else:
-                for alert in active:
-                    print(f"  {alert['symbol']}: {alert['message']} (Priority: {alert['priority']})")
-            
-            print(f"\n📜 RECENT HISTORY ({len(history)}):")
+                lines.extend(
+                    f"  {alert['symbol']}: {alert['message']} (Priority: {alert['priority']})\n"
+                    for alert in active)
+
+            lines.append(f"\n📜 RECENT HISTORY ({len(history)}):\n")
             if not history:
-                print("  No recent alerts")
+                lines.append("  No recent alerts\n")
             else:
                 for alert in history[-5:]:  # Show last 5
                     timestamp = alert.get('triggered_at', alert.get('created_at', 'Unknown'))
-                    print(f"  {alert['symbol']}: {alert['message']} ({timestamp})")
+                    lines.append(f"  {alert['symbol']}: {alert['message']} ({timestamp})\n")
+            sys.stdout.write(''.join(lines))
                     
         except Exception as e:
             print(f"❌ Error viewing alerts: {str(e)}")
@@ -429,10 +683,19 @@ class MarketMirrorApp:
         try:
             self.data_ingestion.clear_cache()
             self.alerts_engine.clear_cache()
+            self.file_cache.clear()
+            self._symbol_cache.clear()
             self.current_market_data = []
+            self.current_market_data_df = None
             self.current_analysis = {}
             self.last_update = None
-            
+            self._last_update_mono = None
+            self._analysis_version += 1
+            self._cached_report = None
+            self._cached_report_version = -1
+            self._cached_summary = None
+            self._cached_summary_version = -1
+
             print("✅ All cached data cleared")
             
         except Exception as e:
@@ -446,7 +709,9 @@ class MarketMirrorApp:
             print(f"Active Alerts: {len(self.alerts_engine.get_active_alerts())}")
             print(f"Cached Market Data: {len(self.current_market_data)} assets")
             print(f"Analysis Available: {'Yes' if self.current_analysis else 'No'}")
-            print(f"Cache Age: {(datetime.now() - self.last_update).seconds if self.last_update else 'N/A'} seconds")
+            age = (int(time.monotonic() - self._last_update_mono)
+                   if self._last_update_mono is not None else 'N/A')
+            print(f"Cache Age: {age} seconds")
             
         except Exception as e:
             print(f"❌ Error getting status: {str(e)}")
@@ -463,10 +728,12 @@ def main():
             print(f"Executing command: {command}")
             
             # Handle direct commands
-            if command.startswith('analyze'):
-                app._handle_analyze_command(command)
+            parts = shlex.split(command.lower())
+            if parts and parts[0] == 'analyze':
+                app._handle_analyze_command(parts[1:])
             else:
                 print("❌ Unknown command. Available: analyze <market> <symbols> <timeframe>")
+            app.shutdown()
         else:
             # Run in interactive mode
             app.interactive_mode()